@@ -1,8 +1,34 @@
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit
 import cv2
 import numpy as np
-import base64
+import inspect
 import os
+import threading
+try:
+    # SIMD-accelerated decoder, drop-in replacement for the stdlib one
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+try:
+    # libjpeg-turbo decoder: SIMD entropy decode and native downscaling
+    from turbojpeg import TurboJPEG
+    _tj = TurboJPEG()
+except Exception:  # package missing or libturbojpeg not found
+    _tj = None
+# decode(dst=...) only exists in PyTurboJPEG 2.x (which needs libjpeg-turbo 3);
+# 1.x decodes into a fresh array instead
+_tj_has_dst = _tj is not None and 'dst' in inspect.signature(_tj.decode).parameters
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    # Serves /static/* from the WSGI layer, before Flask routing is involved
+    from whitenoise import WhiteNoise
+except ImportError:
+    WhiteNoise = None
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,26 +37,83 @@ load_dotenv()
 # Configure Flask to use the frontend folders for static files and templates
 app = Flask(__name__, static_folder='frontend/static', template_folder='frontend/templates')
 
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() via orjson: C-speed encoding with native NumPy scalar/array support"""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Static assets (JS/CSS) are served by WhiteNoise with cache headers instead of
+# going through Flask's send_from_directory. Behind nginx (deploy/nginx.conf)
+# /static/ never reaches Python at all.
+if WhiteNoise is not None:
+    app.wsgi_app = WhiteNoise(app.wsgi_app, root=app.static_folder, prefix='static/', max_age=30 * 24 * 3600)
+
+# Upper bound for one uploaded frame; the client sends ~320px JPEGs (well under
+# 50KB), so anything bigger is a misbehaving client and is rejected early
+MAX_FRAME_BYTES = 200 * 1024
+
+# The deprecated base64 /process_frame route serves older clients that post
+# full-resolution JPEG data URIs (+33% for base64), so it gets a looser cap
+MAX_LEGACY_FRAME_BYTES = 2 * 1024 * 1024
+
+# Frames can also stream over a persistent Socket.IO connection (see handle_frame).
+# Pinned to real threads (gunicorn's gthread worker, or the dev server): MediaPipe,
+# the classifier and JPEG decoding are CPU-bound and would stall a gevent hub.
+socketio = SocketIO(app, async_mode='threading', max_http_buffer_size=MAX_FRAME_BYTES)
+
 # Global variables for lazy loading
 pipeline = None
 
+# The pipeline (MediaPipe graph, classifier state, detection flags) is shared by
+# all requests, so only one request thread runs it at a time. Body reads and
+# image decoding happen outside the lock on the worker's OS threads, so they
+# overlap across concurrent clients (cv2/TurboJPEG release the GIL while decoding).
+_pipeline_lock = threading.Lock()
+
+# Guards first-time construction so the preload thread and an early request
+# don't both build a pipeline
+_pipeline_init_lock = threading.Lock()
+
 def get_pipeline():
     """Lazy load the ASL pipeline"""
     global pipeline
     if pipeline is None:
-        try:
-            from backend.pipeline import ASLPipeline
-            print("🔄 Initializing ASL Pipeline...")
-            pipeline = ASLPipeline()
-            print("✅ ASL Pipeline ready!")
-        except Exception as e:
-            # Don't raise here — log and allow callers to handle the missing pipeline
-            import traceback
-            print("❌ Pipeline initialization failed:", e)
-            traceback.print_exc()
-            pipeline = None
+        with _pipeline_init_lock:
+            if pipeline is None:
+                try:
+                    from backend.pipeline import ASLPipeline
+                    print("🔄 Initializing ASL Pipeline...")
+                    # ASYNC_INFERENCE=1 runs the classifier on a background worker
+                    # (latest finished prediction, one frame behind); off by default
+                    pipeline = ASLPipeline(async_inference=os.environ.get('ASYNC_INFERENCE', '0') == '1')
+                    print("✅ ASL Pipeline ready!")
+                except Exception as e:
+                    # Don't raise here — log and allow callers to handle the missing pipeline
+                    import traceback
+                    print("❌ Pipeline initialization failed:", e)
+                    traceback.print_exc()
+                    pipeline = None
     return pipeline
 
+# Warm the pipeline in the background at startup so the first frame doesn't pay
+# for model loading. Set PRELOAD_PIPELINE=0 to keep it purely lazy.
+if os.environ.get('PRELOAD_PIPELINE', '1') == '1':
+    threading.Thread(target=get_pipeline, name='pipeline-preload', daemon=True).start()
+
 @app.route('/health')
 def health_check():
     print("🏥 HEALTH CHECK - Server is responding")
@@ -105,8 +188,129 @@ def test():
 def testpage():
     return "<h1>Flask is working!</h1><p>No template needed.</p>"
 
+_FRAME_SIZE_LIMITS = {
+    'process_frame_bin': MAX_FRAME_BYTES,
+    'process_frame': MAX_LEGACY_FRAME_BYTES,
+}
+
+@app.before_request
+def limit_frame_size():
+    limit = _FRAME_SIZE_LIMITS.get(request.endpoint)
+    if limit is not None and request.content_length is not None and request.content_length > limit:
+        return jsonify({'success': False, 'error': 'Frame too large'}), 413
+
+# JPEGs at least this wide are decoded at half size; landmarks come back
+# normalized, and the hand tracker doesn't need more pixels than that
+HALF_SCALE_MIN_WIDTH = 640
+
+# Per-thread BGR decode target, reused while the frame size stays the same.
+# Safe because the pipeline never holds on to the frame after process_frame.
+_decode_local = threading.local()
+
+def _frame_buffer(height, width):
+    """Return this thread's (height, width, 3) uint8 decode buffer"""
+    buf = getattr(_decode_local, 'buf', None)
+    if buf is None or buf.shape[:2] != (height, width):
+        buf = _decode_local.buf = np.empty((height, width, 3), dtype=np.uint8)
+    return buf
+
+def _decode_frame(image_bytes):
+    """Decode raw JPEG/PNG bytes into a BGR frame"""
+    # Only JPEGs (SOI marker) go to TurboJPEG; PNGs etc. go straight to OpenCV
+    if _tj is not None and image_bytes[:2] == b'\xff\xd8':
+        try:
+            width, height = _tj.decode_header(image_bytes)[:2]
+            if width >= HALF_SCALE_MIN_WIDTH:
+                scaling_factor = (1, 2)
+                width, height = (width + 1) // 2, (height + 1) // 2
+            else:
+                scaling_factor = None
+            if _tj_has_dst:
+                return _tj.decode(image_bytes, scaling_factor=scaling_factor,
+                                  dst=_frame_buffer(height, width))
+            return _tj.decode(image_bytes, scaling_factor=scaling_factor)
+        except OSError as e:
+            print(f"⚠️ TurboJPEG decode failed, falling back to OpenCV: {e}")
+    
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+def _pipeline_result(frame):
+    """Run a decoded frame through the lazy-loaded pipeline, returning (result, status)"""
+    if frame is None:
+        return {'success': False, 'error': 'Could not decode image'}, 400
+
+    current_pipeline = get_pipeline()
+    if current_pipeline is None:
+        print("❌ process_frame: pipeline not available")
+        return {'success': False, 'error': 'Backend pipeline initialization failed'}, 500
+
+    with _pipeline_lock:
+        result = current_pipeline.process_frame(frame)
+
+    # Debug: Print what we're sending to frontend
+    print(f"🔄 Sending to frontend: {result}")
+
+    return result, 200
+
+def _to_builtin(obj):
+    """Recursively convert NumPy scalars/arrays to plain Python for stdlib json"""
+    if isinstance(obj, dict):
+        return {k: _to_builtin(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_builtin(v) for v in obj]
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    return obj
+
+def _run_pipeline(frame):
+    """Run a decoded frame through the pipeline and build the HTTP response"""
+    result, status = _pipeline_result(frame)
+    return jsonify(result), status
+
+@socketio.on('frame')
+def handle_frame(image_bytes):
+    """Process a binary frame sent over Socket.IO and emit the result back"""
+    try:
+        if not isinstance(image_bytes, (bytes, bytearray)) or not image_bytes:
+            emit('result', {'success': False, 'error': 'No image data'})
+            return
+
+        result, _ = _pipeline_result(_decode_frame(image_bytes))
+        # Socket.IO encodes with stdlib json, not the orjson provider
+        emit('result', _to_builtin(result))
+
+    except Exception as e:
+        print(f"Error processing socket frame: {e}")
+        import traceback
+        traceback.print_exc()
+        emit('result', {
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/process_frame_bin', methods=['POST'])
+def process_frame_bin():
+    """Process a frame posted as raw image bytes (application/octet-stream)"""
+    try:
+        image_bytes = request.get_data(cache=False)
+        if not image_bytes:
+            return jsonify({'success': False, 'error': 'No image data'}), 400
+
+        return _run_pipeline(_decode_frame(image_bytes))
+
+    except Exception as e:
+        print(f"Error processing frame: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
 @app.route('/process_frame', methods=['POST'])
 def process_frame():
+    """Deprecated: base64 data-URI frames, kept for older clients. Use /process_frame_bin."""
     try:
         # Get the image data from the request
         data = request.json
@@ -114,22 +318,9 @@ def process_frame():
         
         # Decode the base64 image
         header, encoded = image_data.split(',', 1)
-        image_bytes = base64.b64decode(encoded)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Process the frame using lazy-loaded pipeline
-        current_pipeline = get_pipeline()
-        if current_pipeline is None:
-            print("❌ process_frame: pipeline not available")
-            return jsonify({'success': False, 'error': 'Backend pipeline initialization failed'}), 500
-
-        result = current_pipeline.process_frame(frame)
-
-        # Debug: Print what we're sending to frontend
-        print(f"🔄 Sending to frontend: {result}")
+        image_bytes = b64decode(encoded, validate=False)
 
-        return jsonify(result)
+        return _run_pipeline(_decode_frame(image_bytes))
         
     except Exception as e:
         print(f"Error processing frame: {e}")
@@ -212,7 +403,7 @@ def reset_demo():
         if current_pipeline is None:
             return jsonify({'success': False, 'error': 'Backend pipeline initialization failed'}), 500
 
-        current_pipeline.reset_conversation()
+        current_pipeline.reset_demo()
         return jsonify({'success': True, 'message': 'Demo reset - ready for new gestures!'})
     except Exception as e:
         return jsonify({
@@ -223,14 +414,20 @@ def reset_demo():
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5001))
+    debug_mode = os.environ.get('FLASK_DEBUG', '0') == '1'
+    # The Werkzeug debugger runs arbitrary code, so debug mode stays on loopback
+    host = '127.0.0.1' if debug_mode else '0.0.0.0'
     print("=" * 50)
-    print("🚀 Starting The HandStand Flask App")
+    print("🚀 Starting The HandStand Flask App (development server)")
     print(f"📁 Templates folder: {os.path.abspath(app.template_folder)}")
     print(f"📁 Static folder: {os.path.abspath(app.static_folder)}")
-    print(f"📍 Main interface: http://0.0.0.0:{port}/")
-    print(f"🔍 Debug page: http://0.0.0.0:{port}/debug")  
-    print(f"🧪 Simple test: http://0.0.0.0:{port}/simple")
-    print("💡 Components will load lazily when first accessed")
-    print("🚫 Debug mode OFF to prevent double-loading")
+    print(f"📍 Main interface: http://{host}:{port}/")
+    print(f"🔍 Debug page: http://{host}:{port}/debug")  
+    print(f"🧪 Simple test: http://{host}:{port}/simple")
+    print("💡 Components preload in the background (PRELOAD_PIPELINE=0 to load on first use)")
+    print("🏭 For production use the Procfile command (gunicorn gthread worker)")
+    if debug_mode:
+        print("🐛 FLASK_DEBUG=1: debugger on, listening on 127.0.0.1 only")
     print("=" * 50)
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    # No reloader, to prevent double-loading
+    socketio.run(app, host=host, port=port, debug=debug_mode, use_reloader=False, allow_unsafe_werkzeug=True)
@@ -7,15 +7,23 @@ import json
 import os
 from typing import Optional, Dict, Any
 from collections import deque
-import tensorflow as tf
+
+SEQUENCE_LENGTH = 30
+NUM_KEYPOINTS = 126
+MIN_FRAMES = 5  # Reduced requirement for faster response: 5 frames instead of 30
 
 class DemoASLClassifier:
-    def __init__(self):
+    def __init__(self, debug=False):
         """Initialize with demo-optimized model"""
         self.model = None
         self.labels_map = {}
         self.idx_to_word = {}
-        self.sequence_buffer = deque(maxlen=30)
+        self.debug = debug
+        
+        # Fixed model input, updated in place each frame. Until SEQUENCE_LENGTH
+        # frames have arrived the tail is padded with the latest frame.
+        self._seq_buf = np.zeros((1, SEQUENCE_LENGTH, NUM_KEYPOINTS), dtype=np.float32)
+        self._seq_len = 0
         
         # Smoothing buffers
         self.prediction_history = deque(maxlen=10)  # Last 10 predictions
@@ -31,6 +39,9 @@ class DemoASLClassifier:
     def load_demo_model(self):
         """Load the demo-optimized model"""
         try:
+            # Imported here so importing this module doesn't pay TensorFlow's startup cost
+            import tensorflow as tf
+            
             # Load labels
             with open("data/labels.json", "r") as f:
                 self.labels_map = json.load(f)
@@ -62,54 +73,47 @@ class DemoASLClassifier:
             
         try:
             # Handle different input formats
-            if len(landmarks) == 126:
-                keypoints = np.array(landmarks)
+            if len(landmarks) == NUM_KEYPOINTS:
+                keypoints = np.asarray(landmarks, dtype=np.float32)
             elif len(landmarks) == 42:
-                # Convert 42-feature to 126-feature
-                keypoints = np.zeros(126)
-                landmarks_xy = np.array(landmarks).reshape(21, 2)
-                for i in range(21):
-                    # First hand
-                    keypoints[i*3] = landmarks_xy[i, 0]
-                    keypoints[i*3 + 1] = landmarks_xy[i, 1]
-                    keypoints[i*3 + 2] = 0.0
-                    # Second hand (copy)
-                    keypoints[63 + i*3] = landmarks_xy[i, 0]
-                    keypoints[63 + i*3 + 1] = landmarks_xy[i, 1]
-                    keypoints[63 + i*3 + 2] = 0.0
+                # Convert 42-feature to 126-feature: x,y with z=0, copied to both hands
+                keypoints = np.zeros((2, 21, 3), dtype=np.float32)
+                keypoints[:, :, :2] = np.asarray(landmarks, dtype=np.float32).reshape(21, 2)
+                keypoints = keypoints.reshape(NUM_KEYPOINTS)
             else:
-                print(f"Warning: Unexpected landmark format: {len(landmarks)}")
+                if self.debug:
+                    print(f"Warning: Unexpected landmark format: {len(landmarks)}")
                 return None
             
-            # Add to sequence buffer
-            self.sequence_buffer.append(keypoints)
+            # Add to the sequence buffer
+            seq = self._seq_buf[0]
+            if self._seq_len < SEQUENCE_LENGTH:
+                # Still filling: write the frame and repeat it over the padded tail
+                seq[self._seq_len:] = keypoints
+                self._seq_len += 1
+            else:
+                # Full: shift one frame left and append
+                seq[:-1] = seq[1:]
+                seq[-1] = keypoints
             
-            # Reduced requirement for faster response: 5 frames instead of 30
-            if len(self.sequence_buffer) < 5:
-                print(f"Building sequence: {len(self.sequence_buffer)}/5 frames")
+            if self._seq_len < MIN_FRAMES:
+                if self.debug:
+                    print(f"Building sequence: {self._seq_len}/{MIN_FRAMES} frames")
                 return None
             
-            # For faster prediction, duplicate the sequence to reach model requirement
-            sequence = np.array(list(self.sequence_buffer))
-            # Repeat the sequence to reach 30 frames
-            while len(sequence) < 30:
-                sequence = np.vstack([sequence, sequence[-1]])
-            
-            # Take last 30 frames
-            sequence = sequence[-30:]
-            sequence = np.expand_dims(sequence, axis=0)
-            
-            # Make prediction
-            predictions = self.model.predict(sequence, verbose=0)
-            predicted_class = np.argmax(predictions[0])
-            confidence = float(predictions[0][predicted_class])
+            # Direct call skips Model.predict's per-call batching/callback setup
+            predictions = np.asarray(self.model(self._seq_buf, training=False))[0]
+            predicted_class = int(np.argmax(predictions))
+            confidence = float(predictions[predicted_class])
             
-            print(f"Demo debug: Raw prediction: {self.idx_to_word.get(predicted_class)} ({confidence:.3f})")
-            print(f"Demo debug: All confidences: {[f'{p:.3f}' for p in predictions[0]]}")
+            if self.debug:
+                print(f"Demo debug: Raw prediction: {self.idx_to_word.get(predicted_class)} ({confidence:.3f})")
+                print(f"Demo debug: All confidences: {[f'{p:.3f}' for p in predictions]}")
             
             # Basic confidence check
             if confidence < self.confidence_threshold:
-                print(f"Demo debug: Confidence too low ({confidence:.3f} < {self.confidence_threshold})")
+                if self.debug:
+                    print(f"Demo debug: Confidence too low ({confidence:.3f} < {self.confidence_threshold})")
                 return None
             
             # Add to prediction history
@@ -125,7 +129,8 @@ class DemoASLClassifier:
             # If no smoothed result, use current prediction if confidence is high
             if confidence > 0.35:  # High confidence threshold for immediate response
                 gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
-                print(f"Demo debug: High confidence prediction: {gesture_name} ({confidence:.3f})")
+                if self.debug:
+                    print(f"Demo debug: High confidence prediction: {gesture_name} ({confidence:.3f})")
                 return {
                     "gesture": gesture_name,
                     "confidence": confidence,
@@ -166,14 +171,16 @@ class DemoASLClassifier:
         agreement_ratio = pred_count / len(recent_predictions)
         avg_confidence = confidence_sums[pred_class] / pred_count
         
-        print(f"Demo debug: Smoothing - {self.idx_to_word.get(pred_class)} appears {pred_count}/{len(recent_predictions)} times")
-        print(f"Demo debug: Agreement ratio: {agreement_ratio:.2f}, Avg confidence: {avg_confidence:.3f}")
+        if self.debug:
+            print(f"Demo debug: Smoothing - {self.idx_to_word.get(pred_class)} appears {pred_count}/{len(recent_predictions)} times")
+            print(f"Demo debug: Agreement ratio: {agreement_ratio:.2f}, Avg confidence: {avg_confidence:.3f}")
         
         # Check if prediction is stable enough
         if agreement_ratio >= self.smoothing_threshold and avg_confidence > 0.25:
             gesture_name = self.idx_to_word.get(pred_class, "Unknown")
             
-            print(f"Demo debug: SMOOTHED PREDICTION: {gesture_name} (agreement: {agreement_ratio:.2f}, conf: {avg_confidence:.3f})")
+            if self.debug:
+                print(f"Demo debug: SMOOTHED PREDICTION: {gesture_name} (agreement: {agreement_ratio:.2f}, conf: {avg_confidence:.3f})")
             
             return {
                 "gesture": gesture_name,
@@ -186,10 +193,11 @@ class DemoASLClassifier:
 
     def reset_buffers(self):
         """Reset all buffers - useful between gestures"""
-        self.sequence_buffer.clear()
+        self._seq_len = 0
         self.prediction_history.clear()
         self.confidence_history.clear()
-        print("Demo debug: Buffers reset")
+        if self.debug:
+            print("Demo debug: Buffers reset")
 
 # Compatibility wrapper
 class EnhancedASLClassifier(DemoASLClassifier):
@@ -0,0 +1,88 @@
+"""
+Numba-compiled geometric features for DemoASLClassifier
+Optional accelerator: if numba is not installed, geometric_features is None
+and the classifier keeps using its NumPy implementation.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, float32
+except ImportError:
+    njit = None
+
+NUM_FEATURES = 21
+
+# Landmark indices: fingertips thumb(4)..pinky(20), their bases, and the palm ring
+FINGERTIPS = (4, 8, 12, 16, 20)
+FINGER_BASES = (2, 5, 9, 13, 17)
+PALM = (0, 5, 9, 13, 17)
+
+geometric_features = None
+
+if njit is not None:
+    @njit(float32[:](float32[:]), cache=True, fastmath=True)
+    def geometric_features(lm):
+        """Same 21 features as DemoASLClassifier, from a flat (x0, y0, ..., x20, y20) buffer"""
+        out = np.empty(NUM_FEATURES, dtype=np.float32)
+        xs = np.empty(21, dtype=np.float32)
+        ys = np.empty(21, dtype=np.float32)
+        norms = np.empty(21, dtype=np.float32)
+
+        # Normalize relative to wrist and track hand size
+        hand_size = 0.0
+        for i in range(21):
+            x = lm[2 * i] - lm[0]
+            y = lm[2 * i + 1] - lm[1]
+            xs[i] = x
+            ys[i] = y
+            d = math.sqrt(x * x + y * y)
+            norms[i] = d
+            if d > hand_size:
+                hand_size = d
+
+        # Tip distances and extension ratios
+        for k in range(5):
+            tip_dist = norms[FINGERTIPS[k]]
+            out[k] = tip_dist
+            out[5 + k] = tip_dist / (norms[FINGER_BASES[k]] + 1e-6)
+
+        # Angles between adjacent fingers
+        for k in range(4):
+            a = FINGERTIPS[k]
+            b = FINGERTIPS[k + 1]
+            cos_angle = (xs[a] * xs[b] + ys[a] * ys[b]) / (norms[a] * norms[b] + 1e-6)
+            out[10 + k] = math.acos(min(1.0, max(-1.0, cos_angle)))
+
+        # Hand orientation (middle finger base)
+        out[14] = math.atan2(ys[9], xs[9])
+
+        # Finger spreads: thumb-index, thumb-middle, index-middle
+        out[15] = math.hypot(xs[4] - xs[8], ys[4] - ys[8])
+        out[16] = math.hypot(xs[4] - xs[12], ys[4] - ys[12])
+        out[17] = math.hypot(xs[8] - xs[12], ys[8] - ys[12])
+
+        # Hand openness
+        cx = 0.0
+        cy = 0.0
+        for k in range(5):
+            cx += xs[PALM[k]]
+            cy += ys[PALM[k]]
+        cx /= 5.0
+        cy /= 5.0
+        openness = 0.0
+        for k in range(5):
+            openness += math.hypot(xs[FINGERTIPS[k]] - cx, ys[FINGERTIPS[k]] - cy)
+        out[18] = openness / 5.0
+
+        # Hand size
+        out[19] = hand_size
+
+        # Thumb position relative to index tip
+        out[20] = math.atan2(ys[4] - ys[8], xs[4] - xs[8])
+
+        return out
+
+    # Compile (or load from the on-disk cache) at import, not on the first frame
+    geometric_features(np.zeros(42, dtype=np.float32))
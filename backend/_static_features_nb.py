@@ -0,0 +1,121 @@
+"""
+Numba-compiled geometric features for StaticASLClassifier
+Optional accelerator: if numba is not installed, geometric_features is None
+and the classifier keeps using its NumPy implementation.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, int64, float32
+except ImportError:
+    njit = None
+
+# Largest output: 50 features per hand, two hands
+MAX_FEATURES = 100
+HAND_FEATURES = 28
+MISSING_HAND_FEATURES = 50
+
+# Landmark indices: fingertips thumb(4)..pinky(20) and their bases
+FINGERTIPS = (4, 8, 12, 16, 20)
+FINGER_BASES = (2, 5, 9, 13, 17)
+# Fingertip pairs for the angle features: 4 adjacent pairs, then the 6 skip pairs
+ANGLE_I = (0, 1, 2, 3, 0, 0, 0, 1, 1, 2)
+ANGLE_J = (1, 2, 3, 4, 2, 3, 4, 3, 4, 4)
+
+geometric_features = None
+
+if njit is not None:
+    @njit(int64(float32[::1], float32[::1]), cache=True, fastmath=True)
+    def geometric_features(lm, out):
+        """
+        Same features as StaticASLClassifier, from a flat 126-value (2 hands x 21 x xyz)
+        buffer. Writes into out (at least MAX_FEATURES long) and returns the count used.
+        """
+        tx = np.empty(5, dtype=np.float32)
+        ty = np.empty(5, dtype=np.float32)
+        tz = np.empty(5, dtype=np.float32)
+        tip_dist = np.empty(5, dtype=np.float32)
+        spreads = np.empty(10, dtype=np.float32)
+
+        n = 0
+        for h in range(2):
+            base = 63 * h
+
+            # Hand not detected (all zeros): 50 zero features
+            present = False
+            for i in range(63):
+                if lm[base + i] != 0.0:
+                    present = True
+                    break
+            if not present:
+                for k in range(MISSING_HAND_FEATURES):
+                    out[n + k] = 0.0
+                n += MISSING_HAND_FEATURES
+                continue
+
+            wx = lm[base]
+            wy = lm[base + 1]
+            wz = lm[base + 2]
+
+            # Tip distances and extension ratios, relative to the wrist
+            for k in range(5):
+                t = base + 3 * FINGERTIPS[k]
+                x = lm[t] - wx
+                y = lm[t + 1] - wy
+                z = lm[t + 2] - wz
+                tx[k] = x
+                ty[k] = y
+                tz[k] = z
+                d = math.sqrt(x * x + y * y + z * z)
+                tip_dist[k] = d
+                out[n + k] = d
+
+                b = base + 3 * FINGER_BASES[k]
+                bx = lm[b] - wx
+                by = lm[b + 1] - wy
+                bz = lm[b + 2] - wz
+                out[n + 5 + k] = d / (math.sqrt(bx * bx + by * by + bz * bz) + 1e-6)
+
+            # Angles between fingertip vectors
+            for k in range(10):
+                a = ANGLE_I[k]
+                b = ANGLE_J[k]
+                cos_angle = (tx[a] * tx[b] + ty[a] * ty[b] + tz[a] * tz[b]) / (tip_dist[a] * tip_dist[b] + 1e-6)
+                out[n + 10 + k] = math.acos(min(1.0, max(-1.0, cos_angle)))
+
+            # Hand orientation (middle finger base)
+            p = base + 27
+            px = lm[p] - wx
+            py = lm[p + 1] - wy
+            pz = lm[p + 2] - wz
+            out[n + 20] = math.atan2(py, px)
+            out[n + 21] = math.atan2(pz, px)
+            out[n + 22] = math.atan2(pz, py)
+
+            # Finger spreads: the 5 largest of the 10 fingertip distances, descending
+            s = 0
+            for i in range(5):
+                for j in range(i + 1, 5):
+                    dx = tx[i] - tx[j]
+                    dy = ty[i] - ty[j]
+                    dz = tz[i] - tz[j]
+                    spreads[s] = math.sqrt(dx * dx + dy * dy + dz * dz)
+                    s += 1
+            # Partial selection sort: pull out the 5 largest in order, leave the rest unsorted
+            for k in range(5):
+                best = k
+                for i in range(k + 1, 10):
+                    if spreads[i] > spreads[best]:
+                        best = i
+                top = spreads[best]
+                spreads[best] = spreads[k]
+                spreads[k] = top
+                out[n + 23 + k] = top
+
+            n += HAND_FEATURES
+        return n
+
+    # Compile (or load from the on-disk cache) at import, not on the first frame
+    geometric_features(np.zeros(126, dtype=np.float32), np.empty(MAX_FEATURES, dtype=np.float32))
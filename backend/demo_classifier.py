@@ -6,8 +6,43 @@ Provides instant, accurate gesture recognition without frame sequences
 import numpy as np
 import os
 import json
-import joblib
 from typing import Optional, Dict, Any
+from backend._demo_features_nb import geometric_features as _geometric_features_nb
+from backend.prediction_cache import PredictionCache, MISS
+
+__all__ = ["DemoASLClassifier", "EnhancedASLClassifier", "ASLClassifier"]
+
+# Landmark index arrays used as fancy indices on every frame
+# Finger tips: thumb(4), index(8), middle(12), ring(16), pinky(20)
+_FINGERTIPS = np.array([4, 8, 12, 16, 20], dtype=np.intp)
+_FINGER_BASES = np.array([2, 5, 9, 13, 17], dtype=np.intp)
+_PALM_IDX = np.array([0, 5, 9, 13, 17], dtype=np.intp)
+# Spread pairs as positions within _FINGERTIPS: thumb-index, thumb-middle, index-middle
+_SPREAD_FROM = np.array([0, 0, 1], dtype=np.intp)
+_SPREAD_TO = np.array([1, 2, 2], dtype=np.intp)
+
+def _result(gesture, confidence):
+    """Prediction dict with plain Python scalars, so jsonify never sees numpy types"""
+    return {'gesture': str(gesture), 'confidence': float(confidence)}
+
+class _TFLiteModel:
+    """Keras-style predict() on top of a TFLite interpreter"""
+    
+    def __init__(self, model_path, num_threads=2):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self._interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        self._input_index = self._interpreter.get_input_details()[0]['index']
+        self._output_index = self._interpreter.get_output_details()[0]['index']
+    
+    def predict(self, x, verbose=0):
+        self._interpreter.set_tensor(self._input_index, np.asarray(x, dtype=np.float32))
+        self._interpreter.invoke()
+        return self._interpreter.get_tensor(self._output_index)
 
 class DemoASLClassifier:
     """
@@ -18,9 +53,15 @@ class DemoASLClassifier:
     def __init__(self):
         self.model = None
         self.scaler = None
+        # Scaler statistics cached at load time for the per-frame fast path
+        self._mean = None
+        self._scale = None
+        self._buf = None
+        self._pred_cache = PredictionCache(maxsize=256)
         self.idx_to_word = {}
         self.word_to_idx = {}
         self.labels_map = {}
+        self._labels_tuple = ()  # idx_to_word as a dense tuple for the per-frame lookup
         self.confidence_threshold = 0.5
         self.model_loaded = False
         
@@ -36,15 +77,36 @@ class DemoASLClassifier:
             print("Static classifier not found. Run: python train_static_classifier.py")
             return False
         
+        try:
+            # Deferred so the mock fallback works without joblib installed
+            import joblib
+        except ImportError:
+            print("joblib not installed - cannot load static classifier")
+            return False
+        
         try:
             model_data = joblib.load(model_path)
             
             self.model = model_data['model']
             self.scaler = model_data['scaler']
-            self.idx_to_word = model_data['idx_to_label']
-            self.word_to_idx = model_data['label_to_idx']
+            # Pickled labels are numpy scalars; keep plain int/str so results serialize as-is
+            self.idx_to_word = {int(k): str(v) for k, v in model_data['idx_to_label'].items()}
+            self.word_to_idx = {str(k): int(v) for k, v in model_data['label_to_idx'].items()}
             self.labels_map = self.idx_to_word
+            self._build_label_lookup()
+            
+            # StandardScaler is frozen after training: keep mean/scale as float32 and
+            # scale into a reusable (1, N) buffer instead of calling transform() per frame.
+            # Only for a plain centering + scaling StandardScaler; anything else
+            # (with_mean/with_std off, other scalers) goes through transform()
+            from sklearn.preprocessing import StandardScaler
+            self._mean = None
+            if isinstance(self.scaler, StandardScaler) and self.scaler.with_mean and self.scaler.with_std:
+                self._mean = self.scaler.mean_.astype(np.float32)
+                self._scale = self.scaler.scale_.astype(np.float32)
+                self._buf = np.empty((1, self._mean.shape[0]), dtype=np.float32)
             
+            self._pred_cache.clear()
             self.model_loaded = True
             self.model_type = 'static'
             print(f"Static classifier loaded: {list(self.labels_map.values())}")
@@ -56,20 +118,32 @@ class DemoASLClassifier:
     
     def load_lstm_fallback(self):
         """Fallback to LSTM model if static model not available"""
+        demo_tflite_path = "data/models/saved_models/demo_model_fp16.tflite"
+        if not os.path.exists(demo_tflite_path):
+            demo_tflite_path = "data/models/saved_models/demo_model.tflite"
+        demo_model_path = "data/models/saved_models/demo_model.h5"
+        demo_info_path = "data/models/demo_model_info.json"
+        
+        # Prefer the TFLite conversion (python convert_to_tflite.py): no TensorFlow
+        # import needed when tflite_runtime is installed
+        try:
+            if os.path.exists(demo_tflite_path) and os.path.exists(demo_info_path):
+                self.model = _TFLiteModel(demo_tflite_path)
+                self._load_lstm_labels(demo_info_path)
+                print(f"LSTM fallback loaded (TFLite): {list(self.labels_map.values())}")
+                self.model_type = 'lstm'
+                self.model_loaded = True
+                return True
+        except Exception as e:
+            print(f"Error loading TFLite fallback: {e}")
+        
         try:
-            import tensorflow as tf
             from tensorflow import keras
             
             # Try to load demo model first
-            demo_model_path = "data/models/saved_models/demo_model.h5"
-            demo_info_path = "data/models/demo_model_info.json"
-            
             if os.path.exists(demo_model_path) and os.path.exists(demo_info_path):
                 self.model = keras.models.load_model(demo_model_path)
-                with open(demo_info_path, 'r') as f:
-                    model_info = json.load(f)
-                self.labels_map = model_info.get('labels_map', {})
-                self.idx_to_word = {int(k): v for k, v in self.labels_map.items()}
+                self._load_lstm_labels(demo_info_path)
                 print(f"LSTM fallback loaded: {list(self.labels_map.values())}")
                 self.model_type = 'lstm'
                 self.model_loaded = True
@@ -80,86 +154,171 @@ class DemoASLClassifier:
         # Create mock classifier if no models available
         self.labels_map = {0: "hello", 1: "no", 2: "please", 3: "thank_you", 4: "yes"}
         self.idx_to_word = self.labels_map
+        self._build_label_lookup()
         self.model_type = 'mock'
         self.model_loaded = True
         print("No models found - using mock classifier")
         return False
     
+    def _load_lstm_labels(self, info_path):
+        with open(info_path, 'r') as f:
+            model_info = json.load(f)
+        self.labels_map = model_info.get('labels_map', {})
+        self.idx_to_word = {int(k): str(v) for k, v in self.labels_map.items()}
+        self._build_label_lookup()
+    
+    def _build_label_lookup(self):
+        """Class ids are dense 0..K-1, so index a tuple instead of hashing into idx_to_word"""
+        size = max(self.idx_to_word) + 1 if self.idx_to_word else 0
+        self._labels_tuple = tuple(self.idx_to_word.get(i, "Unknown") for i in range(size))
+    
+    def _label(self, predicted_class, default="Unknown"):
+        if 0 <= predicted_class < len(self._labels_tuple):
+            return self._labels_tuple[predicted_class]
+        return default
+    
     def extract_geometric_features(self, landmarks):
         """Extract geometric features from hand landmarks"""
         if landmarks is None:
             return None
             
-        # Handle different input formats - convert to (42,) format
+        # Handle different input formats - reduce to (21, 2) x,y of the first hand
         if len(landmarks) == 126:
-            # Convert 126 to 42 format (take just x,y from first hand)
-            landmarks_reshaped = np.array(landmarks).reshape(2, 21, 3)
-            landmarks_42 = []
-            for i in range(21):
-                landmarks_42.extend([landmarks_reshaped[0][i][0], landmarks_reshaped[0][i][1]])
-            landmarks = landmarks_42
-        elif len(landmarks) != 42:
+            landmarks = np.asarray(landmarks, dtype=np.float32).reshape(2, 21, 3)[0, :, :2]
+        elif len(landmarks) == 42:
+            landmarks = np.asarray(landmarks, dtype=np.float32).reshape(21, 2)
+        else:
             return None
         
-        # Reshape to (21, 2) for x,y coordinates
-        landmarks = np.array(landmarks).reshape(21, 2)
-        features = []
+        # Compiled kernel when numba is available
+        if _geometric_features_nb is not None:
+            return _geometric_features_nb(landmarks.ravel())
         
         # Normalize relative to wrist (landmark 0)
-        wrist = landmarks[0]
-        normalized_landmarks = landmarks - wrist
+        normalized_landmarks = landmarks - landmarks[0]
+        norms = np.linalg.norm(normalized_landmarks, axis=1)
+        
+        tips = normalized_landmarks[_FINGERTIPS]
+        tip_norms = norms[_FINGERTIPS]
         
-        # Finger tip landmarks: thumb(4), index(8), middle(12), ring(16), pinky(20)
-        fingertips = [4, 8, 12, 16, 20]
-        finger_bases = [2, 5, 9, 13, 17]
+        features = np.empty(21, dtype=np.float32)
         
         # 1. Distances from wrist to fingertips
-        for tip in fingertips:
-            dist = np.linalg.norm(normalized_landmarks[tip])
-            features.append(dist)
+        features[0:5] = tip_norms
         
         # 2. Finger extension ratios
-        for tip, base in zip(fingertips, finger_bases):
-            tip_dist = np.linalg.norm(normalized_landmarks[tip])
-            base_dist = np.linalg.norm(normalized_landmarks[base])
-            ratio = tip_dist / (base_dist + 1e-6)
-            features.append(ratio)
-        
-        # 3. Angles between fingers
-        for i in range(4):
-            v1 = normalized_landmarks[fingertips[i]]
-            v2 = normalized_landmarks[fingertips[i+1]]
-            cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-            angle = np.arccos(np.clip(cos_angle, -1, 1))
-            features.append(angle)
-        
-        # 4. Hand orientation
-        palm_vector = normalized_landmarks[9]  # Middle finger base
-        features.append(np.arctan2(palm_vector[1], palm_vector[0]))
-        
-        # 5. Finger spreads
-        thumb_index_dist = np.linalg.norm(normalized_landmarks[4] - normalized_landmarks[8])
-        thumb_middle_dist = np.linalg.norm(normalized_landmarks[4] - normalized_landmarks[12])
-        index_middle_dist = np.linalg.norm(normalized_landmarks[8] - normalized_landmarks[12])
-        features.extend([thumb_index_dist, thumb_middle_dist, index_middle_dist])
+        features[5:10] = tip_norms / (norms[_FINGER_BASES] + 1e-6)
+        
+        # 3. Angles between adjacent fingers
+        cos_angle = (tips[:-1] * tips[1:]).sum(axis=1) / (tip_norms[:-1] * tip_norms[1:] + 1e-6)
+        features[10:14] = np.arccos(np.clip(cos_angle, -1, 1))
+        
+        # 4. Hand orientation (middle finger base)
+        features[14] = np.arctan2(normalized_landmarks[9, 1], normalized_landmarks[9, 0])
+        
+        # 5. Finger spreads: thumb-index, thumb-middle, index-middle
+        features[15:18] = np.linalg.norm(tips[_SPREAD_FROM] - tips[_SPREAD_TO], axis=1)
         
         # 6. Hand openness
-        palm_center = np.mean(normalized_landmarks[[0, 5, 9, 13, 17]], axis=0)
-        openness = np.mean([np.linalg.norm(normalized_landmarks[tip] - palm_center) for tip in fingertips])
-        features.append(openness)
+        palm_center = normalized_landmarks[_PALM_IDX].mean(axis=0)
+        features[18] = np.linalg.norm(tips - palm_center, axis=1).mean()
         
         # 7. Hand size
-        hand_size = np.max([np.linalg.norm(normalized_landmarks[i]) for i in range(21)])
-        features.append(hand_size)
+        features[19] = norms.max()
         
-        # 8. Thumb position
-        thumb_pos = normalized_landmarks[4]
-        index_pos = normalized_landmarks[8]
-        thumb_angle = np.arctan2(thumb_pos[1] - index_pos[1], thumb_pos[0] - index_pos[0])
-        features.append(thumb_angle)
+        # 8. Thumb position relative to index tip
+        thumb_to_index = tips[0] - tips[1]
+        features[20] = np.arctan2(thumb_to_index[1], thumb_to_index[0])
         
-        return np.array(features)
+        return features
     
+    def _predict_static(self, landmarks) -> Optional[Dict[str, Any]]:
+        """Run the static geometric classifier on one frame"""
+        # Extract geometric features
+        features = self.extract_geometric_features(landmarks)
+        if features is None:
+            return None
+
+        # Scale features if scaler available
+        if self._mean is not None:
+            np.subtract(features, self._mean, out=self._buf[0])
+            self._buf[0] /= self._scale
+            features_scaled = self._buf
+        else:
+            try:
+                features_scaled = self.scaler.transform([features]) if self.scaler is not None else [features]
+            except Exception:
+                features_scaled = [features]
+
+        # Predict probabilities if available
+        if hasattr(self.model, 'predict_proba'):
+            return self._decide(self.model.predict_proba(features_scaled)[0])
+        # Fallback to direct predict if no predict_proba
+        return self._decide(None, int(self.model.predict(features_scaled)[0]))
+
+    def _decide(self, probabilities, predicted_class=None):
+        """Turn one row of class probabilities (or a bare class) into a result or None"""
+        if probabilities is not None:
+            predicted_class = int(np.argmax(probabilities))
+            confidence = float(probabilities[predicted_class])
+        else:
+            confidence = 1.0
+
+        if confidence < self.confidence_threshold:
+            return None
+
+        return _result(self._label(predicted_class), confidence)
+
+    def predict_batch(self, landmarks_list):
+        """Predict several frames with a single model call, one result (or None) per frame"""
+        if getattr(self, 'model_type', None) != 'static' or self.model is None:
+            return [self.predict_single_frame(landmarks) for landmarks in landmarks_list]
+
+        results = [None] * len(landmarks_list)
+        try:
+            # Serve cache hits directly and collect features for the rest
+            rows, keys, features = [], [], []
+            for i, landmarks in enumerate(landmarks_list):
+                if landmarks is None:
+                    continue
+                cache_key = self._pred_cache.key(landmarks)
+                cached = self._pred_cache.get(cache_key)
+                if cached is not MISS:
+                    results[i] = dict(cached) if cached is not None else None
+                    continue
+                frame_features = self.extract_geometric_features(landmarks)
+                if frame_features is None:
+                    self._pred_cache.put(cache_key, None)
+                    continue
+                rows.append(i)
+                keys.append(cache_key)
+                features.append(frame_features)
+
+            if not features:
+                return results
+
+            # One (B, N) matrix through the scaler and the model
+            batch = np.stack(features).astype(np.float32, copy=False)
+            if self._mean is not None:
+                batch -= self._mean
+                batch /= self._scale
+            elif self.scaler is not None:
+                batch = self.scaler.transform(batch)
+
+            if hasattr(self.model, 'predict_proba'):
+                decided = [self._decide(p) for p in self.model.predict_proba(batch)]
+            else:
+                decided = [self._decide(None, int(c)) for c in self.model.predict(batch)]
+
+            for i, cache_key, result in zip(rows, keys, decided):
+                self._pred_cache.put(cache_key, result)
+                results[i] = dict(result) if result is not None else None
+            return results
+
+        except Exception as e:
+            print(f"Batch prediction error: {e}")
+            return [None] * len(landmarks_list)
+
     def predict_single_frame(self, landmarks) -> Optional[Dict[str, Any]]:
         """Predict gesture from a single frame - INSTANT recognition"""
         if landmarks is None:
@@ -173,32 +332,14 @@ class DemoASLClassifier:
 
             # Use behavior based on detected model type
             if getattr(self, 'model_type', None) == 'static' and self.model is not None:
-                # Use static geometric classifier
-                features = self.extract_geometric_features(landmarks)
-                if features is None:
-                    return None
-
-                # Scale features if scaler available
-                try:
-                    features_scaled = self.scaler.transform([features]) if self.scaler is not None else [features]
-                except Exception:
-                    features_scaled = [features]
-
-                # Predict probabilities if available
-                if hasattr(self.model, 'predict_proba'):
-                    probabilities = self.model.predict_proba(features_scaled)[0]
-                    predicted_class = int(np.argmax(probabilities))
-                    confidence = float(probabilities[predicted_class])
-                else:
-                    # Fallback to direct predict if no predict_proba
-                    predicted_class = int(self.model.predict(features_scaled)[0])
-                    confidence = 1.0
-
-                if confidence < self.confidence_threshold:
-                    return None
-
-                gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
-                return {'gesture': gesture_name, 'confidence': confidence}
+                # Held gestures give near-identical landmarks frame after frame,
+                # so reuse the result for the same quantized landmarks
+                cache_key = self._pred_cache.key(landmarks)
+                result = self._pred_cache.get(cache_key)
+                if result is MISS:
+                    result = self._predict_static(landmarks)
+                    self._pred_cache.put(cache_key, result)
+                return dict(result) if result is not None else None
 
             elif getattr(self, 'model_type', None) == 'mock':
                 # Mock classifier for testing
@@ -208,19 +349,20 @@ class DemoASLClassifier:
                 # Other model types (LSTM or unknown) - try to use generic predict/proba if possible
                 if self.model is not None:
                     try:
+                        # One float32 row: a bare list would be promoted to float64 and
+                        # converted back by the model
+                        x = np.asarray(landmarks, dtype=np.float32)[None]
                         # Attempt to predict using whatever interface is available
                         if hasattr(self.model, 'predict_proba'):
-                            probs = self.model.predict_proba([landmarks])[0]
+                            probs = self.model.predict_proba(x)[0]
                             predicted_class = int(np.argmax(probs))
                             confidence = float(probs[predicted_class])
-                            gesture_name = self.idx_to_word.get(predicted_class, 'Unknown')
                             if confidence < self.confidence_threshold:
                                 return None
-                            return {'gesture': gesture_name, 'confidence': confidence}
+                            return _result(self._label(predicted_class), confidence)
                         else:
-                            pred = self.model.predict([landmarks])[0]
-                            gesture_name = self.idx_to_word.get(int(pred), str(pred))
-                            return {'gesture': gesture_name, 'confidence': 0.6}
+                            pred = self.model.predict(x)[0]
+                            return _result(self._label(int(pred), pred), 0.6)
                     except Exception as e:
                         print(f"Prediction error (generic model): {e}")
                         return None
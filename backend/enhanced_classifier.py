@@ -4,18 +4,50 @@ Simple Enhanced ASL Classifier using teammate's LSTM model
 
 import numpy as np
 import json
+import logging
 import os
-from typing import Optional, Dict, Any
-from collections import deque
-import tensorflow as tf
+import time
+from typing import Optional, Dict, Any, List
+
+SIMPLE_MODEL_H5 = "data/models/saved_models/simple_model.h5"
+# Written by: python convert_to_tflite.py [--float16] simple_model
+SIMPLE_MODEL_TFLITE = "data/models/saved_models/simple_model.tflite"
+SIMPLE_MODEL_TFLITE_FP16 = "data/models/saved_models/simple_model_fp16.tflite"
+
+# Per-frame diagnostics; silent unless DEBUG is enabled for this logger
+logger = logging.getLogger(__name__)
+
+SEQUENCE_LENGTH = 30
+# A failing model raises on every frame; log at most one traceback per interval
+ERROR_LOG_INTERVAL = 1.0
+
+# Mean absolute keypoint change below which the last prediction is reused
+KEYPOINT_DELTA_THRESHOLD = 1e-3
+NUM_KEYPOINTS = 126
+# Row h lists ring positions oldest-to-newest when the write head is at h
+_RING_ORDER = (np.arange(SEQUENCE_LENGTH)[None, :] + np.arange(SEQUENCE_LENGTH)[:, None]) % SEQUENCE_LENGTH
 
 class EnhancedASLClassifier:
     def __init__(self):
         """Initialize with teammate's LSTM model"""
         self.model = None
+        self._infer = None
+        self._infer_batch = None
+        self.interpreter = None
+        self._batch_size = 1
         self.labels_map = {}
         self.idx_to_word = {}
-        self.sequence_buffer = deque(maxlen=30)
+        # Ring buffer of the last 30 frames plus the persistent model input batch
+        self._seq = np.zeros((SEQUENCE_LENGTH, NUM_KEYPOINTS), dtype=np.float32)
+        self._batch = np.zeros((1, SEQUENCE_LENGTH, NUM_KEYPOINTS), dtype=np.float32)
+        self._head = 0
+        self._filled = 0
+        
+        # Keypoints and result of the last frame that actually ran the model
+        self._last_keypoints = np.zeros(NUM_KEYPOINTS, dtype=np.float32)
+        self._last_result = None
+        self._has_last = False
+        self._last_error_log = 0.0
         
         # Load teammate's model and labels
         self.load_model()
@@ -28,106 +60,202 @@ class EnhancedASLClassifier:
                 self.labels_map = json.load(f)
                 self.idx_to_word = {v: k for k, v in self.labels_map.items()}
             
-            # Load LSTM model
-            self.model = tf.keras.models.load_model("data/models/saved_models/simple_model.h5")
+            # fp16 weights when converted, else fp32; both run float XNNPACK kernels with
+            # much lower per-invoke overhead than Keras
+            tflite_path = next((p for p in (SIMPLE_MODEL_TFLITE_FP16, SIMPLE_MODEL_TFLITE) if os.path.exists(p)), None)
+            if tflite_path is not None:
+                # TensorFlow is imported only if the standalone runtime is missing
+                try:
+                    from tflite_runtime.interpreter import Interpreter
+                except ImportError:
+                    import tensorflow as tf
+                    Interpreter = tf.lite.Interpreter
+                self.interpreter = Interpreter(model_path=tflite_path, num_threads=2)
+                self.interpreter.allocate_tensors()
+                self._input_index = self.interpreter.get_input_details()[0]['index']
+                self._output_index = self.interpreter.get_output_details()[0]['index']
+            else:
+                # Imported here: TensorFlow costs seconds and hundreds of MB at import
+                import tensorflow as tf
+                
+                # Load LSTM model
+                self.model = tf.keras.models.load_model(SIMPLE_MODEL_H5)
+                
+                # Trace the forward pass once for the fixed (1, 30, 126) input; calling the
+                # concrete function skips Model.predict's per-call setup
+                model = self.model
+                self._infer = tf.function(
+                    lambda x: model(x, training=False),
+                    input_signature=[tf.TensorSpec([1, 30, 126], tf.float32)],
+                ).get_concrete_function()
+                # Variable batch size for predict_batch
+                self._infer_batch = tf.function(
+                    lambda x: model(x, training=False),
+                    input_signature=[tf.TensorSpec([None, 30, 126], tf.float32)],
+                ).get_concrete_function()
             print(f"✅ Enhanced classifier loaded: {list(self.labels_map.keys())}")
             return True
         except Exception as e:
             print(f"Failed to load enhanced model: {e}")
             return False
 
+    def _forward(self, sequence):
+        """Run a (N, 30, 126) batch of sequences through the loaded model"""
+        if self.interpreter is not None:
+            # Resizing reallocates tensors, so only do it when the batch size changes
+            if sequence.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input_index, sequence.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = sequence.shape[0]
+            self.interpreter.set_tensor(self._input_index, sequence.astype(np.float32, copy=False))
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output_index)
+        import tensorflow as tf  # already loaded by load_model on this path
+        infer = self._infer if sequence.shape[0] == 1 else self._infer_batch
+        return infer(tf.constant(sequence, dtype=tf.float32)).numpy()
+
+    def _push(self, landmarks):
+        """Append one frame to the ring buffer; returns its keypoints row, or None if invalid"""
+        # Handle both 42-feature (old) and 126-feature (new) formats
+        # Written straight into the next ring slot (returned as a view of it)
+        keypoints = self._seq[self._head]
+        if len(landmarks) == 126:
+            # New format: already has 126 features
+            keypoints[:] = landmarks
+        elif len(landmarks) == 42:
+            # Old format: x,y for 21 points into the first hand's (x, y, z) slots, z = 0
+            keypoints.fill(0.0)
+            keypoints[:63].reshape(21, 3)[:, :2] = np.asarray(landmarks, dtype=np.float32).reshape(21, 2)
+        else:
+            logger.warning("Invalid landmarks length: %d", len(landmarks))
+            return None
+        
+        # Add to sequence buffer
+        self._head = (self._head + 1) % SEQUENCE_LENGTH
+        self._filled = min(self._filled + 1, SEQUENCE_LENGTH)
+        logger.debug("Buffer has %d frames", self._filled)
+        return keypoints
+
+    def _assemble(self, out, keypoints):
+        """Write the last 30 frames oldest first into out, padded with the newest frame"""
+        if self._filled < SEQUENCE_LENGTH:
+            # Ring hasn't wrapped yet, so frames sit in order at the front
+            out[:self._filled] = self._seq[:self._filled]
+            out[self._filled:] = keypoints
+        else:
+            np.take(self._seq, _RING_ORDER[self._head], axis=0, out=out)
+
+    def _decide(self, probabilities):
+        """Apply the confidence and margin checks to one row of class probabilities"""
+        # Top two classes from one partial sort, best last
+        top2 = np.argpartition(probabilities, -2)[-2:]
+        if probabilities[top2[0]] > probabilities[top2[1]]:
+            top2 = top2[::-1]
+        predicted_class = int(top2[1])
+        confidence = float(probabilities[predicted_class])
+        second_confidence = float(probabilities[top2[0]])
+        
+        logger.debug("All predictions: %s", probabilities)
+        logger.debug("Top prediction: %s (%.3f)", self.idx_to_word.get(predicted_class), confidence)
+        logger.debug("Second prediction: %s (%.3f)", self.idx_to_word.get(int(top2[0])), second_confidence)
+        
+        # Lower confidence threshold for better responsiveness
+        confidence_threshold = 0.25  # Lowered from 0.4
+        if confidence < confidence_threshold:
+            logger.debug("Confidence too low (%.3f < %s)", confidence, confidence_threshold)
+            return None
+        
+        # Require clear winner but with more lenient threshold
+        if confidence - second_confidence < 0.05:  # Lowered from 0.15
+            logger.debug("Predictions too close (%.3f vs %.3f)", confidence, second_confidence)
+            return None
+        
+        gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
+        
+        logger.debug("Returning gesture: %s (confidence: %.3f)", gesture_name, confidence)
+        return {
+            "gesture": gesture_name,
+            "confidence": confidence,
+            "success": True
+        }
+
     def predict_single_frame(self, landmarks) -> Optional[Dict[str, Any]]:
         """Predict gesture using LSTM model"""
-        if self.model is None or landmarks is None:
+        if (self.model is None and self.interpreter is None) or landmarks is None:
             return None
             
         try:
-            # Handle both 42-feature (old) and 126-feature (new) formats
-            if len(landmarks) == 126:
-                # New format: already has 126 features
-                keypoints = np.array(landmarks)
-            elif len(landmarks) == 42:
-                # Old format: convert x,y for 21 points to 126 features
-                keypoints = np.zeros(126)
-                for i in range(0, 42, 2):
-                    idx = i // 2
-                    keypoints[idx * 3] = landmarks[i]      # x
-                    keypoints[idx * 3 + 1] = landmarks[i + 1]  # y
-                    keypoints[idx * 3 + 2] = 0.0           # z
-            else:
-                print(f"Classifier debug: Invalid landmarks length: {len(landmarks)}")
+            keypoints = self._push(landmarks)
+            if keypoints is None:
                 return None
             
-            # Add to sequence buffer
-            self.sequence_buffer.append(keypoints)
-            print(f"Classifier debug: Buffer has {len(self.sequence_buffer)} frames")
-            
             # Very low threshold for testing
-            if len(self.sequence_buffer) < 5:
-                print(f"Classifier debug: Need more frames, have {len(self.sequence_buffer)}/5")
+            if self._filled < 5:
+                logger.debug("Need more frames, have %d/5", self._filled)
                 return None
             
-            # Prepare sequence (use last 30 frames, pad if needed)
-            sequence = np.array(list(self.sequence_buffer))
-            if len(sequence) < 30:
-                padding = np.tile(sequence[-1], (30 - len(sequence), 1))
-                sequence = np.vstack([sequence, padding])
-            else:
-                sequence = sequence[-30:]
+            # Hand hasn't moved since the last inference: reuse its result
+            if self._has_last and np.abs(keypoints - self._last_keypoints).mean() < KEYPOINT_DELTA_THRESHOLD:
+                return dict(self._last_result) if self._last_result is not None else None
             
             # Make prediction
-            sequence = np.expand_dims(sequence, axis=0)
-            predictions = self.model.predict(sequence, verbose=0)
-            
-            predicted_class = np.argmax(predictions[0])
-            confidence = float(predictions[0][predicted_class])
-            
-            print(f"Classifier debug: Predicted {predicted_class} with confidence {confidence}")
-            print(f"Classifier debug: All predictions: {predictions[0]}")
-            
-            # Get top 2 predictions to check if they're close
-            top_2_indices = np.argsort(predictions[0])[-2:]
-            top_1_conf = float(predictions[0][top_2_indices[1]])
-            top_2_conf = float(predictions[0][top_2_indices[0]])
-            
-            print(f"Classifier debug: Top prediction: {self.idx_to_word.get(top_2_indices[1])} ({top_1_conf:.3f})")
-            print(f"Classifier debug: Second prediction: {self.idx_to_word.get(top_2_indices[0])} ({top_2_conf:.3f})")
-            
-            # Simple prediction logic with adjusted thresholds
-            print(f"Classifier debug: Original prediction: {self.idx_to_word.get(predicted_class)} ({confidence:.3f})")
-            
-            # Lower confidence threshold for better responsiveness
-            confidence_threshold = 0.25  # Lowered from 0.4
-            if confidence < confidence_threshold:
-                print(f"Classifier debug: Confidence too low ({confidence:.3f} < {confidence_threshold})")
-                return None
+            self._assemble(self._batch[0], keypoints)
+            predictions = self._forward(self._batch)
+            result = self._decide(predictions[0])
             
-            # Check if the top prediction is significantly better than others
-            sorted_indices = np.argsort(predictions[0])[::-1]
-            top_1_conf = predictions[0][sorted_indices[0]]
-            top_2_conf = predictions[0][sorted_indices[1]] if len(sorted_indices) > 1 else 0
+            self._last_keypoints[:] = keypoints
+            self._last_result = result
+            self._has_last = True
+            return dict(result) if result is not None else None
             
-            # Require clear winner but with more lenient threshold
-            if top_1_conf - top_2_conf < 0.05:  # Lowered from 0.15
-                print(f"Classifier debug: Predictions too close ({top_1_conf:.3f} vs {top_2_conf:.3f})")
-                return None
-            
-            # Use the original prediction
-            gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
-            final_confidence = confidence
+        except Exception:
+            self._log_error("Prediction error")
+            return None
+
+    def _log_error(self, message):
+        """Log the current exception with traceback, at most once per ERROR_LOG_INTERVAL"""
+        now = time.monotonic()
+        if now - self._last_error_log >= ERROR_LOG_INTERVAL:
+            self._last_error_log = now
+            logger.exception(message)
+
+    def predict_batch(self, landmarks_list) -> List[Optional[Dict[str, Any]]]:
+        """
+        Predict several queued frames with one model call
+        Frames are pushed in order, exactly as repeated predict_single_frame calls would,
+        and the resulting (N, 30, 126) sequences run through the model together.
+        """
+        results = [None] * len(landmarks_list)
+        if self.model is None and self.interpreter is None:
+            return results
+        
+        try:
+            rows = []
+            sequences = np.empty((len(landmarks_list), SEQUENCE_LENGTH, NUM_KEYPOINTS), dtype=np.float32)
+            for i, landmarks in enumerate(landmarks_list):
+                keypoints = self._push(landmarks) if landmarks is not None else None
+                if keypoints is None or self._filled < 5:
+                    continue
+                self._assemble(sequences[len(rows)], keypoints)
+                rows.append(i)
             
-            print(f"Classifier debug: Returning gesture: {gesture_name} (confidence: {final_confidence:.3f})")
-            return {
-                "gesture": gesture_name,
-                "confidence": final_confidence,
-                "success": True
-            }
+            if rows:
+                predictions = self._forward(sequences[:len(rows)])
+                for i, probabilities in zip(rows, predictions):
+                    results[i] = self._decide(probabilities)
+                
+                # The newest predicted frame becomes predict_single_frame's still-hand
+                # reference, as if it had been predicted on its own
+                last = rows[-1]
+                self._last_keypoints[:] = sequences[len(rows) - 1, -1]
+                self._last_result = results[last]
+                self._has_last = True
+                results = [dict(r) if r is not None else None for r in results]
+            return results
             
-        except Exception as e:
-            print(f"Prediction error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        except Exception:
+            self._log_error("Batch prediction error")
+            return results
 
 # Compatibility wrapper
 class ASLClassifier(EnhancedASLClassifier):
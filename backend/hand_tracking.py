@@ -3,12 +3,26 @@ Hand Tracking Module using MediaPipe and OpenCV
 """
 
 import cv2
-import mediapipe as mp
 import numpy as np
 
+# Frames whose 32x32 grayscale thumbnail differs from the last processed one by
+# less than this mean absolute difference (0-255 scale) reuse its landmarks
+FRAME_DIFF_THRESHOLD = 3.0
+THUMBNAIL_SIZE = (32, 32)
+# A finger-shape change with the hand held still can stay under the threshold,
+# so cached landmarks are reused for at most this many frames in a row
+MAX_REUSED_FRAMES = 5
+
+# Wider frames are downscaled before hand detection. Landmarks come back
+# normalized to [0, 1], so callers see the same coordinates either way.
+MAX_INPUT_WIDTH = 320
+
 class HandTracker:
     def __init__(self):
         """Initialize MediaPipe hand tracking pipeline"""
+        # Imported on first use so importing the backend doesn't load MediaPipe
+        import mediapipe as mp
+        
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
@@ -18,39 +32,66 @@ class HandTracker:
         )
         self.mp_drawing = mp.solutions.drawing_utils
         
+        # Reused per frame: 2 hands x 21 landmarks x (x, y, z) = 126 features
+        self._landmarks_buf = np.zeros((2, 21, 3), dtype=np.float32)
+        
+        # BGR->RGB destination, reallocated only when the frame size changes
+        self._rgb_buf = None
+        
+        # Thumbnail and result of the last frame MediaPipe actually processed
+        self._last_small = None
+        self._last_landmarks = None
+        self._reused_frames = 0
+        
     def detect_hands(self, frame):
-        """Detect hands in the given frame and return landmarks in 126-feature format"""
+        """Detect hands in the given frame and return landmarks as a 126-feature float32 array"""
         if frame is None:
             return None
             
         try:
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Keep the aspect ratio: normalized landmarks would be distorted otherwise
+            height, width = frame.shape[:2]
+            if width > MAX_INPUT_WIDTH:
+                frame = cv2.resize(frame, (MAX_INPUT_WIDTH, round(height * MAX_INPUT_WIDTH / width)),
+                                   interpolation=cv2.INTER_AREA)
             
-            # Process the frame
-            results = self.hands.process(rgb_frame)
+            # Near-identical to the last processed frame: skip the MediaPipe graph,
+            # unless the cached result has already been reused MAX_REUSED_FRAMES times
+            small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), THUMBNAIL_SIZE,
+                               interpolation=cv2.INTER_AREA).astype(np.int16)
+            if self._last_small is not None and self._reused_frames < MAX_REUSED_FRAMES and \
+                    np.abs(small - self._last_small).mean() < FRAME_DIFF_THRESHOLD:
+                self._reused_frames += 1
+                return self._last_landmarks
+            
+            # Convert BGR to RGB into the reused buffer
+            if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+                self._rgb_buf = np.empty_like(frame)
+            rgb_frame = self._rgb_buf
+            rgb_frame.flags.writeable = True
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
             
-            # Initialize 126 features (21 landmarks * 2 hands * 3 coordinates)
-            landmarks = np.zeros(126)
+            # Process the frame; read-only input lets MediaPipe wrap it without copying
+            rgb_frame.flags.writeable = False
+            results = self.hands.process(rgb_frame)
             
+            landmarks = None
             if results.multi_hand_landmarks:
-                # Process detected hands (up to 2)
-                for hand_idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    if hand_idx >= 2:  # Only process first 2 hands
-                        break
-                        
-                    # Extract x,y,z coordinates for all 21 landmarks
-                    start_idx = hand_idx * 63  # 63 features per hand
-                    
-                    for landmark_idx, landmark in enumerate(hand_landmarks.landmark):
-                        base_idx = start_idx + landmark_idx * 3
-                        landmarks[base_idx] = landmark.x      # x coordinate
-                        landmarks[base_idx + 1] = landmark.y  # y coordinate  
-                        landmarks[base_idx + 2] = landmark.z  # z coordinate (depth)
+                # Missing second hand stays zero
+                buf = self._landmarks_buf
+                buf.fill(0.0)
                 
-                return landmarks.tolist()
-            else:
-                return None
+                # Process detected hands (up to 2), one row assignment per hand
+                for hand_idx, hand_landmarks in enumerate(results.multi_hand_landmarks[:2]):
+                    buf[hand_idx] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+                
+                # float32 array, the dtype the classifiers work in; copied because buf is reused
+                landmarks = buf.reshape(126).copy()
+            
+            self._last_small = small
+            self._last_landmarks = landmarks
+            self._reused_frames = 0
+            return landmarks
                 
         except Exception as e:
             print(f"Error in hand detection: {e}")
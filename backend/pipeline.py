@@ -7,6 +7,10 @@ MediaPipe → Gemini → ElevenLabs Agent Integration
 import os
 import cv2
 import time
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, Optional
 from backend.hand_tracking import HandTracker
 from backend.demo_classifier import DemoASLClassifier
@@ -15,13 +19,34 @@ from backend.translator import GeminiTranslator
 from backend.speech import SpeechSynthesizer
 from utils.config import PREDICTION_CONFIG
 
+# Per-frame diagnostics; silent unless DEBUG is enabled for this logger
+logger = logging.getLogger(__name__)
+
+# How long a detection waits for Gemini before speaking the raw gesture instead
+TRANSLATION_WAIT_SECONDS = 0.3
+
 class ASLPipeline:
     """Simple pipeline for web interface ASL recognition"""
     
-    def __init__(self):
+    def __init__(self, async_inference=False):
         """Initialize simplified pipeline for web processing"""
         self.hand_tracker = HandTracker()
         self.classifier = DemoASLClassifier()
+        
+        # Optional background classifier: process_frame hands landmarks to a worker
+        # (newest frame wins) and reports the latest finished prediction. That result
+        # lags one submitted frame behind, so it only pays off for continuous
+        # high-FPS streams with a slow model; off by default.
+        self.async_inference = async_inference
+        self._latest_prediction = None
+        # Bumped whenever earlier predictions stop applying (hand left the frame,
+        # detection started/stopped, demo reset); results from an older generation
+        # are discarded by the worker
+        self._generation = 0
+        self._prediction_lock = threading.Lock()
+        if async_inference:
+            self._infer_queue = queue.Queue(maxsize=1)
+            threading.Thread(target=self._inference_worker, name='classifier', daemon=True).start()
         # Initialize translation and speech but don't fail if they have issues
         try:
             self.translator = GeminiTranslator()
@@ -35,6 +60,13 @@ class ASLPipeline:
             print("Speech disabled - continuing without it")
             self.speech_synthesizer = None
         
+        # Gemini calls run here so a detection never blocks on them; a timed-out
+        # translation keeps its worker until the request's own deadline
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pipeline-translate')
+        # Speech gets its own single worker: utterances play one after another and
+        # never queue behind slow translations
+        self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline-speech')
+        
         # State for single-gesture detection mode
         self.detected_gestures = []
         self.last_gesture = None
@@ -61,13 +93,13 @@ class ASLPipeline:
             # Always process frames for live feedback, regardless of detection_active
             # Step 1: Detect hands using MediaPipe
             landmarks = self.hand_tracker.detect_hands(frame)
-            print(f"Debug: Landmarks detected: {landmarks is not None}")
+            logger.debug("Landmarks detected: %s", landmarks is not None)
             
             if landmarks is not None:
-                print(f"Debug: Landmarks shape: {len(landmarks) if landmarks is not None else 0}")
+                logger.debug("Landmarks shape: %d", len(landmarks))
                 # Step 2: Classify gesture using single frame
-                prediction = self.classifier.predict_single_frame(landmarks)
-                print(f"Debug: Prediction result: {prediction}")
+                prediction = self._classify(landmarks)
+                logger.debug("Prediction result: %s", prediction)
                 
                 if prediction and prediction.get('confidence', 0) > 0.15:
                     gesture = prediction['gesture']
@@ -87,21 +119,29 @@ class ASLPipeline:
                         improved_sentence = display_gesture  # Start with just the gesture
                         
                         # Improve sentence with Gemini (if available) - but keep it simple for single gestures
+                        # Wait briefly; a slow or failing Gemini call falls back to the raw gesture
                         if self.translator:
                             try:
                                 # For single gestures, maybe just clean up the text slightly
-                                improved_sentence = self.translator.improve_sentence(display_gesture)
+                                future = self._executor.submit(self.translator.improve_sentence, display_gesture)
+                                improved_sentence = future.result(timeout=TRANSLATION_WAIT_SECONDS)
                                 if not improved_sentence or improved_sentence.strip() == "":
                                     improved_sentence = display_gesture
+                            except FutureTimeoutError:
+                                print("⏱️ Translation slow - speaking the gesture as-is")
+                                improved_sentence = display_gesture
                             except:
                                 improved_sentence = display_gesture
                         
-                        # Generate speech with ElevenLabs IMMEDIATELY (if available)
+                        # Generate speech with ElevenLabs IMMEDIATELY (if available), in the
+                        # background so the response doesn't wait for download and playback.
+                        # speech_played therefore means "speech started".
                         speech_success = False
                         if self.speech_synthesizer:
                             try:
                                 print(f"🔊 Speaking: {improved_sentence}")
-                                speech_success = self.speech_synthesizer.speak_text(improved_sentence)
+                                self._speech_executor.submit(self._speak, improved_sentence)
+                                speech_success = True
                             except Exception as e:
                                 print(f"Speech synthesis error: {e}")
                         
@@ -140,11 +180,14 @@ class ASLPipeline:
                             'live_preview': True  # Flag to indicate this is live preview
                         }
                 else:
-                    print(f"Debug: Prediction confidence too low: {prediction.get('confidence', 0) if prediction else 'None'}")
+                    logger.debug("Prediction confidence too low: %s", prediction.get('confidence', 0) if prediction else None)
+            else:
+                # Hand left the frame: the background result describes a gesture that's gone
+                self._reset_inference()
             
             # No gesture detected
             if self.detection_active:
-                print("Debug: No gesture detected, still listening...")
+                logger.debug("No gesture detected, still listening...")
                 return {
                     'gesture': None,
                     'confidence': 0.0,
@@ -171,11 +214,59 @@ class ASLPipeline:
                 'success': False
             }
     
+    def _speak(self, text):
+        try:
+            return self.speech_synthesizer.speak_text(text)
+        except Exception as e:
+            print(f"Speech synthesis error: {e}")
+            return False
+    
+    def _classify(self, landmarks):
+        """Classify one frame, inline or through the background worker"""
+        if not self.async_inference:
+            return self.classifier.predict_single_frame(landmarks)
+        
+        # Drop a frame still waiting in the slot so the worker always gets the newest
+        try:
+            self._infer_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._infer_queue.put_nowait((self._generation, landmarks))
+        except queue.Full:
+            pass
+        return self._latest_prediction
+    
+    def _inference_worker(self):
+        while True:
+            generation, landmarks = self._infer_queue.get()
+            try:
+                prediction = self.classifier.predict_single_frame(landmarks)
+            except Exception as e:
+                print(f"Background inference error: {e}")
+                continue
+            with self._prediction_lock:
+                # Computed before a reset: throw it away
+                if generation == self._generation:
+                    self._latest_prediction = prediction
+    
+    def _reset_inference(self):
+        """Forget the background prediction and any frame still queued for it"""
+        with self._prediction_lock:
+            self._generation += 1
+            self._latest_prediction = None
+        if self.async_inference:
+            try:
+                self._infer_queue.get_nowait()
+            except queue.Empty:
+                pass
+    
     def reset_demo(self):
         """Reset the demo - clear gesture history"""
         self.detected_gestures = []
         self.last_gesture = None
         self.gesture_count = 0
+        self._reset_inference()
         print("Demo reset - gesture history cleared")
     
     def start_detection(self):
@@ -184,12 +275,14 @@ class ASLPipeline:
         self.last_gesture = None
         # Clear any accumulated gestures for fresh start
         self.detected_gestures = []
+        self._reset_inference()
         print("🎯 Detection started - show your gesture!")
     
     def stop_detection(self):
         """Stop gesture detection mode"""
         self.detection_active = False
         self.last_spoken_gesture = None  # Reset for next session
+        self._reset_inference()
         print("🛑 Detection stopped")
 
 class ASLTranslationPipeline:
@@ -0,0 +1,50 @@
+"""
+Prediction Cache
+Bounded LRU of classifier results keyed on quantized hand landmarks
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+# Returned by PredictionCache.get on a miss (None is a valid cached result)
+MISS = object()
+
+
+class PredictionCache:
+    """
+    LRU cache for per-frame predictions
+    A held gesture yields near-identical landmarks on consecutive frames, so
+    landmarks are quantized before hashing and those frames share one entry.
+    """
+
+    def __init__(self, maxsize=256, scale=128):
+        self.maxsize = maxsize
+        self.scale = scale  # quantization steps per unit of normalized coordinate
+        self._entries = OrderedDict()
+
+    def key(self, landmarks):
+        """Quantized fingerprint of a landmark vector"""
+        quantized = np.round(np.asarray(landmarks, dtype=np.float32) * self.scale)
+        return quantized.astype(np.int16).tobytes()
+
+    def get(self, key, default=MISS):
+        """Return the cached result for key, or default on a miss"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -5,9 +5,11 @@ Supports ElevenLabs and Google TTS
 
 import io
 import requests
-import pygame
-import tempfile
+from requests.adapters import HTTPAdapter
 import os
+import shutil
+import subprocess
+import threading
 from utils.config import get_elevenlabs_api_key, get_google_tts_config
 
 class SpeechSynthesizer:
@@ -25,9 +27,25 @@ class SpeechSynthesizer:
             "use_speaker_boost": True
         }
         
+        # One keep-alive session for all ElevenLabs calls, so repeat requests skip
+        # the TCP + TLS handshake
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        if self.elevenlabs_api_key:
+            self._session.headers.update({"xi-api-key": self.elevenlabs_api_key})
+        
+        # Resolved once; None when espeak isn't installed
+        self._espeak_path = shutil.which("espeak")
+        
+        # pygame.mixer.music is one global player: serialize playback so a second
+        # utterance (pipeline or /speak) waits instead of cutting off the first
+        self._playback_lock = threading.Lock()
+        
         # Initialize pygame for audio playback
         self.pygame_initialized = False
         try:
+            # Imported here so the module loads without pygame (and its SDL init) installed
+            import pygame
             pygame.mixer.init()
             self.pygame_initialized = True
             print("Audio system initialized")
@@ -71,17 +89,12 @@ class SpeechSynthesizer:
         try:
             url = f"https://api.elevenlabs.io/v1/convai/agents/{self.agent_id}/speak"
             
-            headers = {
-                "xi-api-key": self.elevenlabs_api_key,
-                "Content-Type": "application/json"
-            }
-            
             data = {
                 "text": text,
                 "voice_settings": self.voice_settings
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = self._session.post(url, json=data, timeout=30)
             response.raise_for_status()
             
             # Play audio directly from response
@@ -102,12 +115,9 @@ class SpeechSynthesizer:
             voice_id = "21m00Tcm4TlvDq8ikWAM"
         
         try:
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-            
-            headers = {
-                "xi-api-key": self.elevenlabs_api_key,
-                "Content-Type": "application/json"
-            }
+            # Streaming endpoint sends audio as it is synthesized rather than after the
+            # whole utterance is rendered
+            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
             
             data = {
                 "text": text,
@@ -115,12 +125,14 @@ class SpeechSynthesizer:
                 "model_id": "eleven_monolingual_v1"
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
+            with self._session.post(url, json=data, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                audio_buffer = io.BytesIO()
+                for chunk in response.iter_content(chunk_size=4096):
+                    audio_buffer.write(chunk)
             
             # Play audio
-            audio_data = response.content
-            return self._play_audio(audio_data)
+            return self._play_audio(audio_buffer.getvalue())
             
         except Exception as e:
             print(f"ElevenLabs TTS error: {e}")
@@ -135,32 +147,32 @@ class SpeechSynthesizer:
             speaker.Speak(text)
             return True
         except:
-            try:
-                # Try espeak (cross-platform)
-                os.system(f'echo "{text}" | espeak')
-                return True
-            except:
-                print(f"Speaking (fallback): {text}")
-                return False
+            # Try espeak (cross-platform): text piped to its stdin, no shell or echo involved
+            if self._espeak_path:
+                try:
+                    subprocess.run([self._espeak_path], input=text, text=True, check=False)
+                    return True
+                except OSError:
+                    pass
+            print(f"Speaking (fallback): {text}")
+            return False
     
     def _play_audio(self, audio_data):
         """Play audio data using pygame"""
         try:
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_data)
-                temp_filename = temp_file.name
-            
-            # Load and play with pygame
-            pygame.mixer.music.load(temp_filename)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
+            import pygame
+            
+            # Load and play straight from memory - no temp file write/unlink per utterance.
+            # The buffer must stay alive until playback finishes (it does: we wait below).
+            audio_buffer = io.BytesIO(audio_data)
+            with self._playback_lock:
+                pygame.mixer.music.load(audio_buffer, 'mp3')
+                pygame.mixer.music.play()
+                
+                # Wait for playback to complete
+                while pygame.mixer.music.get_busy():
+                    pygame.time.wait(100)
             
-            # Clean up
-            os.unlink(temp_filename)
             return True
             
         except Exception as e:
@@ -174,9 +186,8 @@ class SpeechSynthesizer:
         
         try:
             url = "https://api.elevenlabs.io/v1/voices"
-            headers = {"xi-api-key": self.elevenlabs_api_key}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             
             voices_data = response.json()
@@ -7,7 +7,28 @@ import numpy as np
 import os
 import json
 import joblib
-from typing import Optional, Dict, Any
+from collections import deque
+from sklearn.preprocessing import StandardScaler
+from typing import Optional, Dict, Any, List
+from backend._static_features_nb import (
+    geometric_features as _geometric_features_nb, MAX_FEATURES, HAND_FEATURES, MISSING_HAND_FEATURES
+)
+from backend.prediction_cache import PredictionCache, MISS
+
+# Fingertip pairs (positions in FINGERTIPS), enumerated once at import: the 4
+# adjacent pairs, then the 6 pairs two or more fingers apart
+_ANGLE_PAIRS = np.array([(i, i + 1) for i in range(4)] + [(i, j) for i in range(5) for j in range(i + 2, 5)])
+# All 10 fingertip pairs for the spread distances
+_SPREAD_PAIRS = np.array([(i, j) for i in range(5) for j in range(i + 1, 5)])
+
+# Palm orientation angles arctan2(y, x), arctan2(z, x), arctan2(z, y) as coordinate indices
+_PALM_NUM = np.array([1, 2, 2])
+_PALM_DEN = np.array([0, 0, 1])
+
+STATIC_MODEL_PKL = "data/models/static_classifier.pkl"
+# Written by: python convert_to_onnx.py (scaler folded into the graph)
+STATIC_MODEL_ONNX = "data/models/static_classifier.onnx"
+
 
 class StaticASLClassifier:
     """
@@ -15,21 +36,43 @@ class StaticASLClassifier:
     Provides instant recognition without requiring frame sequences
     """
     
-    def __init__(self):
+    # Finger tip landmarks: thumb(4), index(8), middle(12), ring(16), pinky(20)
+    FINGERTIPS = np.array([4, 8, 12, 16, 20])
+    # Finger base landmarks: thumb(2), index(5), middle(9), ring(13), pinky(17)
+    FINGER_BASES = np.array([2, 5, 9, 13, 17])
+    _MISSING_HAND = np.zeros(MISSING_HAND_FEATURES, dtype=np.float32)
+    
+    def __init__(self, include_probabilities=False):
         self.model = None
         self.scaler = None
+        # Per-class probability dicts cost O(classes) objects per frame; only build
+        # them for callers that ask (top_k() covers the common "best few" case)
+        self.include_probabilities = include_probabilities
+        self._class_names = ()
+        self._onnx_session = None
+        # Scaler statistics cached at load time for the fused per-frame scaling
+        self._mean = None
+        self._inv_scale = None
+        self._scaled = None
         self.idx_to_word = {}
         self.word_to_idx = {}
         self.gesture_names = []
         self.confidence_threshold = 0.6
         self.model_loaded = False
         
+        # Reused output of the compiled feature kernel
+        self._feat_buf = np.empty(MAX_FEATURES, dtype=np.float32)
+        # Results for recent quantized landmarks (512 steps per unit, ~2px on a 640px frame)
+        self._pred_cache = PredictionCache(maxsize=256, scale=512)
+        # Frames queued with queue_frame(), predicted together by flush()
+        self._pending = deque()
+        
         # Load model if available
         self.load_model()
     
     def load_model(self):
         """Load the trained static classifier model"""
-        model_path = "data/models/static_classifier.pkl"
+        model_path = STATIC_MODEL_PKL
         
         if not os.path.exists(model_path):
             print("No static classifier found. Train one with train_static_classifier.py")
@@ -43,7 +86,36 @@ class StaticASLClassifier:
             self.idx_to_word = model_data['idx_to_label']
             self.word_to_idx = model_data['label_to_idx']
             self.gesture_names = model_data['gesture_names']
+            self._class_names = tuple(
+                self.idx_to_word.get(i, f"class_{i}") for i in range(len(self.model.classes_))
+            ) if hasattr(self.model, 'classes_') else tuple(self.gesture_names)
+            
+            # StandardScaler is frozen after training: scale as one fused
+            # (features - mean) * inv_scale into a reusable buffer, skipping transform()'s
+            # validation and copies. Only for a plain centering + scaling StandardScaler;
+            # anything else (with_mean/with_std off, other scalers) uses transform()
+            self._mean = None
+            if isinstance(self.scaler, StandardScaler) and self.scaler.with_mean and self.scaler.with_std:
+                self._mean = self.scaler.mean_.astype(np.float32)
+                self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+                self._scaled = np.empty((1, self._mean.shape[0]), dtype=np.float32)
+            
+            # ONNX Runtime runs scaler + model in one call without sklearn's per-call
+            # overhead; optional, the pickled model is used when it's unavailable
+            self._onnx_session = None
+            if os.path.exists(STATIC_MODEL_ONNX):
+                try:
+                    import onnxruntime as ort
+                    self._onnx_session = ort.InferenceSession(STATIC_MODEL_ONNX, providers=['CPUExecutionProvider'])
+                    self._onnx_input = self._onnx_session.get_inputs()[0].name
+                    # Outputs are (label, probabilities)
+                    self._onnx_proba = self._onnx_session.get_outputs()[1].name
+                    print(f"Static classifier using ONNX Runtime: {STATIC_MODEL_ONNX}")
+                except Exception as e:
+                    self._onnx_session = None
+                    print(f"ONNX model not used ({e}), falling back to scikit-learn")
             
+            self._pred_cache.clear()
             self.model_loaded = True
             print(f"Static classifier loaded: {self.gesture_names}")
             return True
@@ -60,110 +132,68 @@ class StaticASLClassifier:
         if landmarks is None:
             return None
             
-        # Handle different input formats
-        if len(landmarks) == 42:
-            # Convert 42-feature to 126-feature format
-            landmarks_xy = np.array(landmarks).reshape(21, 2)
-            landmarks_126 = np.zeros(126)
-            for i in range(21):
-                # First hand
-                landmarks_126[i*3] = landmarks_xy[i, 0]
-                landmarks_126[i*3 + 1] = landmarks_xy[i, 1]
-                landmarks_126[i*3 + 2] = 0.0
-                # Second hand (copy for single hand detection)
-                landmarks_126[63 + i*3] = landmarks_xy[i, 0]
-                landmarks_126[63 + i*3 + 1] = landmarks_xy[i, 1]
-                landmarks_126[63 + i*3 + 2] = 0.0
-            landmarks = landmarks_126
-        elif len(landmarks) != 126:
+        # Handle different input formats - reshape once to (2 hands, 21 landmarks, xyz)
+        single = len(landmarks) == 42
+        if single:
+            # 42-feature format is one hand of x,y with z=0; the model was trained with it
+            # copied to both hands, so compute its features once and duplicate them
+            hands = np.zeros((2, 21, 3), dtype=np.float32)
+            hands[0, :, :2] = np.asarray(landmarks, dtype=np.float32).reshape(21, 2)
+        elif len(landmarks) == 126:
+            hands = np.asarray(landmarks, dtype=np.float32).reshape(2, 21, 3)
+        else:
             print(f"Warning: Unexpected landmark format: {len(landmarks)}")
             return None
         
-        # Reshape to get 21 landmarks with (x, y, z) coordinates for each hand
-        landmarks = np.array(landmarks).reshape(2, 21, 3)
+        # Compiled kernel when numba is available; the result is a view of a reused
+        # buffer, overwritten by the next call
+        if _geometric_features_nb is not None:
+            n = _geometric_features_nb(np.ascontiguousarray(hands).reshape(126), self._feat_buf)
+            if single and n == HAND_FEATURES + MISSING_HAND_FEATURES:
+                # Present hand then the empty slot: duplicate the hand instead
+                self._feat_buf[HAND_FEATURES:2 * HAND_FEATURES] = self._feat_buf[:HAND_FEATURES]
+                n = 2 * HAND_FEATURES
+            return self._feat_buf[:n]
         
-        features = []
+        if single:
+            hands = hands[:1]
         
-        # Process each hand separately
-        for hand_idx in range(2):
-            hand_landmarks = landmarks[hand_idx]
-            
-            # Skip if hand not detected (all zeros)
-            if np.all(hand_landmarks == 0):
-                features.extend([0] * 50)  # Add 50 zero features for missing hand
-                continue
-            
-            # Wrist position (landmark 0)
-            wrist = hand_landmarks[0]
-            
-            # Normalize all landmarks relative to wrist
-            normalized_landmarks = hand_landmarks - wrist
-            
-            # Finger tip landmarks: thumb(4), index(8), middle(12), ring(16), pinky(20)
-            fingertips = [4, 8, 12, 16, 20]
-            # Finger base landmarks: thumb(2), index(5), middle(9), ring(13), pinky(17)
-            finger_bases = [2, 5, 9, 13, 17]
-            
-            # Feature 1-5: Distances from wrist to fingertips
-            for tip in fingertips:
-                dist = np.linalg.norm(normalized_landmarks[tip])
-                features.append(dist)
-            
-            # Feature 6-10: Finger extension ratios (tip distance / base distance)
-            for i, (tip, base) in enumerate(zip(fingertips, finger_bases)):
-                tip_dist = np.linalg.norm(normalized_landmarks[tip])
-                base_dist = np.linalg.norm(normalized_landmarks[base])
-                ratio = tip_dist / (base_dist + 1e-6)  # Avoid division by zero
-                features.append(ratio)
-            
-            # Feature 11-20: Angles between adjacent fingers
-            finger_vectors = []
-            for tip in fingertips:
-                vector = normalized_landmarks[tip]
-                finger_vectors.append(vector)
-            
-            # Calculate angles between adjacent finger vectors
-            for i in range(len(finger_vectors)-1):
-                v1 = finger_vectors[i]
-                v2 = finger_vectors[i+1]
-                # Calculate angle using dot product
-                cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-                angle = np.arccos(np.clip(cos_angle, -1, 1))
-                features.append(angle)
-                
-            # Add more angle features
-            for i in range(len(finger_vectors)):
-                for j in range(i+2, len(finger_vectors)):
-                    v1 = finger_vectors[i]
-                    v2 = finger_vectors[j]
-                    cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-                    angle = np.arccos(np.clip(cos_angle, -1, 1))
-                    features.append(angle)
-            
-            # Feature 21-25: Hand orientation (palm direction)
-            # Vector from wrist to middle finger base
-            palm_vector = normalized_landmarks[9]
-            
-            # Palm orientation angles
-            palm_x_angle = np.arctan2(palm_vector[1], palm_vector[0])
-            palm_y_angle = np.arctan2(palm_vector[2], palm_vector[0])
-            palm_z_angle = np.arctan2(palm_vector[2], palm_vector[1])
-            
-            features.extend([palm_x_angle, palm_y_angle, palm_z_angle])
-            
-            # Feature 26-30: Finger spread measures
-            # Distances between fingertips
-            finger_spreads = []
-            for i in range(len(fingertips)):
-                for j in range(i+1, len(fingertips)):
-                    dist = np.linalg.norm(normalized_landmarks[fingertips[i]] - normalized_landmarks[fingertips[j]])
-                    finger_spreads.append(dist)
-            
-            # Take first 5 most important spreads
-            finger_spreads.sort(reverse=True)
-            features.extend(finger_spreads[:5])
+        # Normalize all landmarks relative to wrist (landmark 0)
+        normalized = hands - hands[:, :1, :]
+        tips = normalized[:, self.FINGERTIPS, :]
+        
+        # Features 1-5: Distances from wrist to fingertips
+        tip_dist = np.sqrt(np.einsum('hij,hij->hi', tips, tips))
+        
+        # Features 6-10: Finger extension ratios (tip distance / base distance)
+        bases = normalized[:, self.FINGER_BASES, :]
+        ratios = tip_dist / (np.sqrt(np.einsum('hij,hij->hi', bases, bases)) + 1e-6)
         
-        return np.array(features)
+        # Features 11-20: Angles between adjacent fingers, then between fingers two or more apart
+        # All pairwise dot products from one batched (5x3)(3x5) matmul; the epsilon
+        # stays on the norm product, as the classifier was trained with it
+        a, b = _ANGLE_PAIRS[:, 0], _ANGLE_PAIRS[:, 1]
+        gram = tips @ tips.transpose(0, 2, 1)
+        angles = np.arccos(np.clip(gram[:, a, b] / (tip_dist[:, a] * tip_dist[:, b] + 1e-6), -1, 1))
+        
+        # Features 21-23: Hand orientation - palm vector is wrist to middle finger base
+        # - all three angles for both hands in one arctan2 call
+        palm = normalized[:, 9, :]
+        palm_angles = np.arctan2(palm[:, _PALM_NUM], palm[:, _PALM_DEN])
+        
+        # Features 24-28: Finger spreads - the 5 largest of the 10 fingertip distances
+        spreads = np.linalg.norm(tips[:, _SPREAD_PAIRS[:, 0], :] - tips[:, _SPREAD_PAIRS[:, 1], :], axis=-1)
+        top_spreads = -np.sort(-np.partition(spreads, 5, axis=1)[:, 5:], axis=1)
+        
+        per_hand = np.concatenate([tip_dist, ratios, angles, palm_angles, top_spreads], axis=1)
+        
+        # A hand that wasn't detected (all zeros) contributes 50 zero features instead
+        present = hands.any(axis=(1, 2))
+        if single:
+            return np.tile(per_hand[0] if present[0] else self._MISSING_HAND, 2)
+        if present.all():
+            return per_hand.ravel()
+        return np.concatenate([per_hand[h] if present[h] else self._MISSING_HAND for h in range(2)])
     
     def predict_single_frame(self, landmarks) -> Optional[Dict[str, Any]]:
         """
@@ -173,38 +203,157 @@ class StaticASLClassifier:
         if not self.model_loaded or self.model is None or landmarks is None:
             return None
         
+        # No hand in frame (all-zero landmarks): nothing to classify
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if not landmarks.any():
+            return None
+        
+        # A still hand gives the same quantized landmarks frame after frame, so
+        # reuse the result instead of re-running features, scaler and model
+        cache_key = self._pred_cache.key(landmarks)
+        result = self._pred_cache.get(cache_key)
+        if result is MISS:
+            try:
+                result = self._predict_uncached(landmarks)
+            except Exception as e:
+                print(f"Static classifier prediction error: {e}")
+                return None
+            self._pred_cache.put(cache_key, result)
+        return dict(result) if result is not None else None
+    
+    def _predict_uncached(self, landmarks) -> Optional[Dict[str, Any]]:
+        """Run feature extraction, scaler and model on one frame"""
+        # Extract geometric features
+        features = self.extract_geometric_features(landmarks)
+        if features is None:
+            return None
+        
+        # Get prediction probabilities
+        return self._decide(self._predict_proba(features.reshape(1, -1))[0])
+    
+    def _predict_proba(self, features):
+        """Class probabilities for a (B, N) matrix of unscaled features"""
+        if self._onnx_session is not None:
+            return self._onnx_session.run([self._onnx_proba], {self._onnx_input: features.astype(np.float32, copy=False)})[0]
+        if self._mean is None:
+            return self.model.predict_proba(self.scaler.transform(features))
+        if features.shape[0] == 1:
+            scaled = self._scaled
+            np.subtract(features, self._mean, out=scaled)
+        else:
+            scaled = features - self._mean
+        np.multiply(scaled, self._inv_scale, out=scaled)
+        return self.model.predict_proba(scaled)
+    
+    def _decide(self, probabilities) -> Optional[Dict[str, Any]]:
+        """Turn one row of class probabilities into a result, or None below the threshold"""
+        predicted_class = np.argmax(probabilities)
+        confidence = float(probabilities[predicted_class])
+        
+        # Check confidence threshold
+        if confidence < self.confidence_threshold:
+            return None
+        
+        gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
+        
+        result = {
+            'gesture': gesture_name,
+            'confidence': confidence
+        }
+        if self.include_probabilities:
+            result['probabilities'] = dict(zip(self._class_names, probabilities.tolist()))
+        return result
+    
+    def top_k(self, landmarks, k=3):
+        """
+        The k most likely gestures for one frame as (gesture, probability) pairs, best
+        first, without the confidence threshold. Empty if nothing can be predicted.
+        """
+        if not self.model_loaded or self.model is None or landmarks is None:
+            return []
+        
         try:
-            # Extract geometric features
             features = self.extract_geometric_features(landmarks)
             if features is None:
-                return None
-            
-            # Scale features
-            features_scaled = self.scaler.transform([features])
-            
-            # Get prediction probabilities
-            probabilities = self.model.predict_proba(features_scaled)[0]
-            predicted_class = np.argmax(probabilities)
-            confidence = float(probabilities[predicted_class])
+                return []
+            probabilities = self._predict_proba(features.reshape(1, -1))[0]
+        except Exception as e:
+            print(f"Static classifier prediction error: {e}")
+            return []
+        
+        # Partial selection of the k best, then order just those
+        k = min(k, len(probabilities))
+        top = np.argpartition(probabilities, -k)[-k:]
+        top = top[np.argsort(probabilities[top])[::-1]]
+        return [(self.idx_to_word.get(int(i), f"class_{i}"), float(probabilities[i])) for i in top]
+    
+    def predict_batch(self, landmarks_list) -> List[Optional[Dict[str, Any]]]:
+        """
+        Predict several frames with one scaler + model call
+        Returns one result (or None) per frame, in order.
+        """
+        results = [None] * len(landmarks_list)
+        if not self.model_loaded or self.model is None:
+            return results
+        
+        try:
+            # Serve cache hits directly and collect features for the rest
+            rows, keys, features = [], [], []
+            for i, landmarks in enumerate(landmarks_list):
+                if landmarks is None:
+                    continue
+                landmarks = np.asarray(landmarks, dtype=np.float32)
+                if not landmarks.any():
+                    continue
+                cache_key = self._pred_cache.key(landmarks)
+                cached = self._pred_cache.get(cache_key)
+                if cached is not MISS:
+                    results[i] = dict(cached) if cached is not None else None
+                    continue
+                frame_features = self.extract_geometric_features(landmarks)
+                if frame_features is None:
+                    self._pred_cache.put(cache_key, None)
+                    continue
+                rows.append(i)
+                keys.append(cache_key)
+                # Copied: the compiled extractor reuses its output buffer
+                features.append(np.array(frame_features))
             
-            # Check confidence threshold
-            if confidence < self.confidence_threshold:
-                return None
+            if not features:
+                return results
             
-            gesture_name = self.idx_to_word.get(predicted_class, "Unknown")
+            # One (B, N) matrix through the scaler and the model per feature length:
+            # one- and two-hand frames give different N and can't share a stack
+            groups = {}
+            for j, frame_features in enumerate(features):
+                groups.setdefault(len(frame_features), []).append(j)
             
-            return {
-                'gesture': gesture_name,
-                'confidence': confidence,
-                'probabilities': {
-                    self.idx_to_word.get(i, f"class_{i}"): float(prob) 
-                    for i, prob in enumerate(probabilities)
-                }
-            }
+            for group in groups.values():
+                try:
+                    probabilities = self._predict_proba(np.stack([features[j] for j in group]))
+                except Exception as e:
+                    # e.g. a length the model wasn't trained on; the other groups still run
+                    print(f"Static classifier batch prediction error: {e}")
+                    continue
+                for j, row in zip(group, probabilities):
+                    result = self._decide(row)
+                    self._pred_cache.put(keys[j], result)
+                    results[rows[j]] = dict(result) if result is not None else None
+            return results
             
         except Exception as e:
-            print(f"Static classifier prediction error: {e}")
-            return None
+            print(f"Static classifier batch prediction error: {e}")
+            return [None] * len(landmarks_list)
+    
+    def queue_frame(self, landmarks):
+        """Queue a frame for the next flush() instead of predicting it immediately"""
+        self._pending.append(landmarks)
+    
+    def flush(self) -> List[Optional[Dict[str, Any]]]:
+        """Predict all queued frames in one batch and clear the queue"""
+        frames = list(self._pending)
+        self._pending.clear()
+        return self.predict_batch(frames) if frames else []
     
     def predict(self, landmarks):
         """Compatibility method for existing pipeline"""
@@ -213,6 +362,8 @@ class StaticASLClassifier:
     def set_confidence_threshold(self, threshold: float):
         """Adjust confidence threshold for predictions"""
         self.confidence_threshold = max(0.1, min(0.95, threshold))
+        # Cached results were decided against the old threshold
+        self._pred_cache.clear()
         print(f"Confidence threshold set to: {self.confidence_threshold}")
 
 # Create aliases for compatibility
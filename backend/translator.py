@@ -3,9 +3,39 @@ Translation Module using Google Generative AI (Gemini) with Service Account
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from google.oauth2 import service_account
 import google.generativeai as genai
-from utils.config import get_gemini_api_key
+from utils.config import get_gemini_api_key, TRANSLATION_CONFIG
+
+SUPPORTED_LANGUAGES = MappingProxyType({
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "zh": "Chinese"
+})
+
+TRANSLATE_PROMPT = "Translate this text to {language}: '{text}'. Return only the translation."
+
+IMPROVE_PROMPT = """
+Improve this ASL gesture sequence into natural English:
+"{sentence}"
+
+Make it a clear, natural-sounding sentence. 
+Use correct grammar and add missing connecting words.
+Return ONLY the improved sentence.
+"""
+
+# Per-request deadline so a stalled call can't hold a pipeline worker
+REQUEST_OPTIONS = {"timeout": TRANSLATION_CONFIG["translation_timeout"]}
+
+# Distinct prompts remembered per translator; the UI re-sends the same short phrases
+PROMPT_CACHE_SIZE = 1024
 
 
 class GeminiTranslator:
@@ -13,6 +43,8 @@ class GeminiTranslator:
         """Initialize Gemini with a Google Cloud Service Account."""
         self.service_account_path = get_gemini_api_key()  # Should return path/to/key.json
         self.model = None
+        # Per-instance memo of prompt -> response text; failures raise and aren't cached
+        self._generate = lru_cache(maxsize=PROMPT_CACHE_SIZE)(self._generate_uncached)
 
         try:
             self.setup_authentication()
@@ -38,12 +70,20 @@ class GeminiTranslator:
             scopes=["https://www.googleapis.com/auth/generative-language"]
         )
 
-        # Configure Gemini
-        genai.configure(credentials=credentials)
+        # Configure Gemini over one persistent gRPC channel, reused by every request
+        genai.configure(credentials=credentials, transport="grpc")
         self.model = genai.GenerativeModel("models/gemini-pro")
 
+        self._generate.cache_clear()
         print("Google Gemini configured using service account")
 
+    def _generate_uncached(self, prompt):
+        """Send one prompt to Gemini and return the stripped response text"""
+        response = self.model.generate_content(prompt, request_options=REQUEST_OPTIONS)
+        if not response or not response.text:
+            raise ValueError("empty response")
+        return response.text.strip()
+
     # ===============================
     # TRANSLATE TEXT
     # ===============================
@@ -52,17 +92,12 @@ class GeminiTranslator:
         if not text or not text.strip() or not self.model:
             return ""
 
-        lang_names = self.get_supported_languages()
-        target_lang_name = lang_names.get(target_language, "Spanish")
+        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, "Spanish")
 
-        prompt = f"Translate this text to {target_lang_name}: '{text}'. Return only the translation."
+        prompt = TRANSLATE_PROMPT.format(language=target_lang_name, text=text)
 
         try:
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                return response.text.strip()
-
-            return f"Translation to {target_lang_name}: {text}"
+            return self._generate(prompt)
 
         except Exception as e:
             print(f"Translation error: {e}")
@@ -80,22 +115,11 @@ class GeminiTranslator:
         if len(asl_sentence.split()) == 1:
             return asl_sentence
 
-        prompt = f"""
-Improve this ASL gesture sequence into natural English:
-"{asl_sentence}"
-
-Make it a clear, natural-sounding sentence. 
-Use correct grammar and add missing connecting words.
-Return ONLY the improved sentence.
-"""
+        prompt = IMPROVE_PROMPT.format(sentence=asl_sentence)
 
         try:
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                improved = response.text.strip().strip('"').strip("'")
-                return improved if improved else asl_sentence
-
-            return asl_sentence
+            improved = self._generate(prompt).strip('"').strip("'")
+            return improved if improved else asl_sentence
 
         except Exception as e:
             print(f"Gemini sentence improvement error: {e}")
@@ -105,13 +129,4 @@ Return ONLY the improved sentence.
     # SUPPORTED LANGUAGES
     # ===============================
     def get_supported_languages(self):
-        return {
-            "es": "Spanish",
-            "fr": "French",
-            "de": "German",
-            "it": "Italian",
-            "pt": "Portuguese",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "zh": "Chinese"
-        }
+        return SUPPORTED_LANGUAGES
@@ -0,0 +1,48 @@
+"""
+Convert the trained static classifier to ONNX
+Run once after training; StaticASLClassifier picks up the .onnx file next to
+the .pkl and runs it with onnxruntime instead of scikit-learn.
+
+    python convert_to_onnx.py
+
+The StandardScaler is folded into the graph in front of the model, so one
+session.run() on raw features replaces scaler.transform + predict_proba.
+"""
+
+import os
+import joblib
+
+STATIC_MODEL_PKL = "data/models/static_classifier.pkl"
+STATIC_MODEL_ONNX = "data/models/static_classifier.onnx"
+
+
+def convert(pkl_path=STATIC_MODEL_PKL, onnx_path=STATIC_MODEL_ONNX):
+    """Convert the pickled scaler + model to a single ONNX graph"""
+    from sklearn.pipeline import Pipeline
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    if not os.path.exists(pkl_path):
+        print(f"❌ {pkl_path} not found")
+        return None
+
+    model_data = joblib.load(pkl_path)
+    scaler = model_data['scaler']
+    pipeline = Pipeline([('scaler', scaler), ('model', model_data['model'])])
+
+    onx = convert_sklearn(
+        pipeline,
+        initial_types=[('X', FloatTensorType([None, scaler.n_features_in_]))],
+        # Plain (N, C) probability tensor instead of a list of {class: prob} maps
+        options={id(model_data['model']): {'zipmap': False}},
+    )
+    with open(onnx_path, "wb") as f:
+        f.write(onx.SerializeToString())
+
+    size_kb = os.path.getsize(onnx_path) / 1024
+    print(f"✅ {pkl_path} -> {onnx_path} ({size_kb:.1f} KB)")
+    return onnx_path
+
+
+if __name__ == "__main__":
+    convert()
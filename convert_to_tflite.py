@@ -0,0 +1,75 @@
+"""
+Convert saved Keras LSTM models to TFLite
+Run once after training; the classifiers pick up the .tflite file next to
+the .h5 and no longer need TensorFlow at inference time.
+
+    python convert_to_tflite.py                 # demo_model
+    python convert_to_tflite.py simple_model demo_model
+    python convert_to_tflite.py --float16 simple_model   # simple_model_fp16.tflite
+
+The input is frozen to 30-frame sequences (batch size stays variable), the
+only length the classifiers feed, so models trained with a dynamic time axis
+still convert to a fixed-shape graph.
+
+Weights stay float32 by default: dynamic-range int8 LSTM kernels are
+slower than the float XNNPACK path on x86. --float16 halves the file and
+weight memory with no int8 kernels involved; loaders prefer *_fp16.tflite.
+"""
+
+import argparse
+import os
+
+SAVED_MODELS_DIR = "data/models/saved_models"
+SEQUENCE_LENGTH = 30
+NUM_KEYPOINTS = 126
+
+
+def convert(name, quantize=False, float16=False):
+    """Convert data/models/saved_models/<name>.h5 to <name>.tflite (or <name>_fp16.tflite)"""
+    import tensorflow as tf
+
+    h5_path = os.path.join(SAVED_MODELS_DIR, f"{name}.h5")
+    suffix = "_fp16" if float16 else ""
+    tflite_path = os.path.join(SAVED_MODELS_DIR, f"{name}{suffix}.tflite")
+
+    if not os.path.exists(h5_path):
+        print(f"❌ {h5_path} not found")
+        return None
+
+    model = tf.keras.models.load_model(h5_path)
+    # Trace at the fixed (N, 30, 126) shape rather than the model's (None, None, 126)
+    forward = tf.function(lambda x: model(x, training=False)).get_concrete_function(
+        tf.TensorSpec([None, SEQUENCE_LENGTH, NUM_KEYPOINTS], tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([forward], model)
+    if float16:
+        # float16 weights, dequantized to float32 at load
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize:
+        # Dynamic-range quantization: int8 weights, float activations
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    with open(tflite_path, "wb") as f:
+        f.write(converter.convert())
+
+    size_kb = os.path.getsize(tflite_path) / 1024
+    print(f"✅ {h5_path} -> {tflite_path} ({size_kb:.1f} KB)")
+    return tflite_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Keras .h5 models to TFLite")
+    parser.add_argument("models", nargs="*", default=["demo_model"],
+                        help="model names under data/models/saved_models (without .h5)")
+    parser.add_argument("--dynamic-range", action="store_true",
+                        help="quantize weights to int8 (smaller, usually slower on x86)")
+    parser.add_argument("--float16", action="store_true",
+                        help="store weights as float16, written to <name>_fp16.tflite")
+    args = parser.parse_args()
+
+    for name in args.models:
+        convert(name, quantize=args.dynamic_range, float16=args.float16)
+
+
+if __name__ == "__main__":
+    main()
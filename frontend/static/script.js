@@ -30,6 +30,23 @@ document.addEventListener('DOMContentLoaded', function() {
     let running = false;
     let processingInterval = null;
 
+    // Frames are downscaled to this width before upload; hand landmarks don't
+    // improve beyond it and it keeps each JPEG to a few tens of KB
+    const CAPTURE_WIDTH = 320;
+    const captureCanvas = document.createElement('canvas');
+    const captureCtx = captureCanvas.getContext('2d');
+
+    // Persistent Socket.IO channel for frames when the client library loaded
+    const socket = (typeof io === 'function') ? io({ transports: ['websocket'] }) : null;
+    let awaitingResult = false;
+    if (socket) {
+        socket.on('result', result => {
+            awaitingResult = false;
+            handleResult(result);
+        });
+        socket.on('disconnect', () => { awaitingResult = false; });
+    }
+
     async function startStream() {
         try {
             stream = await navigator.mediaDevices.getUserMedia({ video: { width: { ideal: 1280 }, height: { ideal: 720 } }, audio: false });
@@ -76,92 +93,111 @@ document.addEventListener('DOMContentLoaded', function() {
         console.log('Processing frame...');
         
         try {
-            // Create a canvas to capture the current video frame
-            const canvas = document.createElement('canvas');
-            const ctx = canvas.getContext('2d');
-            canvas.width = video.videoWidth;
-            canvas.height = video.videoHeight;
-            
-            // Draw the current video frame to the canvas
-            ctx.drawImage(video, 0, 0);
+            // Draw the current video frame into the reused capture canvas,
+            // scaled to CAPTURE_WIDTH and keeping the camera's aspect ratio
+            const width = Math.min(CAPTURE_WIDTH, video.videoWidth);
+            const height = Math.round(video.videoHeight * width / video.videoWidth);
+            if (captureCanvas.width !== width || captureCanvas.height !== height) {
+                captureCanvas.width = width;
+                captureCanvas.height = height;
+            }
+            captureCtx.drawImage(video, 0, 0, width, height);
             
-            // Convert canvas to base64 image data
-            const imageData = canvas.toDataURL('image/jpeg', 0.8);
+            // Encode the canvas as raw JPEG bytes (no base64 round-trip)
+            const blob = await new Promise(resolve => captureCanvas.toBlob(resolve, 'image/jpeg', 0.7));
+            if (!blob) {
+                console.warn('Frame encoding failed, skipping');
+                return;
+            }
             
             console.log('Sending frame to backend...');
             
-            // Send frame to backend for processing
-            const response = await fetch('/process_frame', {
+            // Send over the socket when connected (one frame in flight at a time),
+            // otherwise fall back to a plain HTTP POST
+            if (socket && socket.connected) {
+                if (awaitingResult) {
+                    console.log('Previous frame still processing, skipping');
+                    return;
+                }
+                awaitingResult = true;
+                socket.emit('frame', await blob.arrayBuffer());
+                return;
+            }
+            
+            const response = await fetch('/process_frame_bin', {
                 method: 'POST',
                 headers: {
-                    'Content-Type': 'application/json',
+                    'Content-Type': 'application/octet-stream',
                 },
-                body: JSON.stringify({ image: imageData })
+                body: blob
             });
             
-            const result = await response.json();
-            console.log('🔄 Backend response received:', JSON.stringify(result, null, 2));
-            
-            // Always try to update UI elements if they exist
-            const currentGesture = document.getElementById('currentGesture');
-            const confidenceEl = document.getElementById('confidence'); 
-            const gestureCount = document.getElementById('gestureCount');
-            const translationText = translationTextEl; // Use resolved element from load
-            
-            console.log('🎯 UI Elements found:', {
-                currentGesture: !!currentGesture,
-                confidenceEl: !!confidenceEl,
-                gestureCount: !!gestureCount,
-                translationText: !!translationText
-            });
-            
-            if (result.success) {
-                // Update translation text
-                if (result.translation) {
-                    if (translationText) {
-                        translationText.textContent = result.translation;
-                        console.log('✅ Updated translation text to:', result.translation);
-                    } else {
-                        updateTextOutput(result.translation);
-                        console.log('✅ Updated text output (fallback) to:', result.translation);
-                    }
+            handleResult(await response.json());
+        } catch (error) {
+            console.error('Error processing frame:', error);
+        }
+    }
+
+    function handleResult(result) {
+        console.log('🔄 Backend response received:', JSON.stringify(result, null, 2));
+        
+        // Always try to update UI elements if they exist
+        const currentGesture = document.getElementById('currentGesture');
+        const confidenceEl = document.getElementById('confidence'); 
+        const gestureCount = document.getElementById('gestureCount');
+        const translationText = translationTextEl; // Use resolved element from load
+        
+        console.log('🎯 UI Elements found:', {
+            currentGesture: !!currentGesture,
+            confidenceEl: !!confidenceEl,
+            gestureCount: !!gestureCount,
+            translationText: !!translationText
+        });
+        
+        if (result.success) {
+            // Update translation text
+            if (result.translation) {
+                if (translationText) {
+                    translationText.textContent = result.translation;
+                    console.log('✅ Updated translation text to:', result.translation);
+                } else {
+                    updateTextOutput(result.translation);
+                    console.log('✅ Updated text output (fallback) to:', result.translation);
                 }
+            }
+            
+            // Update gesture info if gesture detected
+            if (result.gesture && result.gesture !== 'Unknown' && result.gesture !== null) {
+                const confidence = (result.confidence * 100).toFixed(1);
                 
-                // Update gesture info if gesture detected
-                if (result.gesture && result.gesture !== 'Unknown' && result.gesture !== null) {
-                    const confidence = (result.confidence * 100).toFixed(1);
-                    
-                    if (currentGesture) {
-                        // Add visual indicator for live preview vs confirmed detection
-                        const prefix = result.live_preview ? "👁️ " : "✅ ";
-                        currentGesture.textContent = prefix + result.gesture;
-                        console.log('✅ Updated currentGesture to:', prefix + result.gesture);
-                    }
-                    if (confidenceEl) {
-                        confidenceEl.textContent = `${confidence}%`;
-                        console.log('✅ Updated confidence to:', `${confidence}%`);
-                    }
-                    
-                    // Also update main text output for backup
-                    if (!result.live_preview) {
-                        updateTextOutput(`Detected: ${result.gesture} (${confidence}% confident)`);
-                    }
-                } else if (!result.detection_active && !result.live_preview) {
-                    // Clear gesture info when no hand is detected and not in detection mode
-                    if (currentGesture) currentGesture.textContent = 'None';
-                    if (confidenceEl) confidenceEl.textContent = '0%';
+                if (currentGesture) {
+                    // Add visual indicator for live preview vs confirmed detection
+                    const prefix = result.live_preview ? "👁️ " : "✅ ";
+                    currentGesture.textContent = prefix + result.gesture;
+                    console.log('✅ Updated currentGesture to:', prefix + result.gesture);
+                }
+                if (confidenceEl) {
+                    confidenceEl.textContent = `${confidence}%`;
+                    console.log('✅ Updated confidence to:', `${confidence}%`);
                 }
                 
-                // Update gesture count only for confirmed detections (not live preview)
-                if (result.gesture_count !== undefined && gestureCount && !result.live_preview) {
-                    gestureCount.textContent = result.gesture_count.toString();
-                    console.log('✅ Updated gesture count to:', result.gesture_count);
+                // Also update main text output for backup
+                if (!result.live_preview) {
+                    updateTextOutput(`Detected: ${result.gesture} (${confidence}% confident)`);
                 }
-            } else {
-                console.log('❌ Processing failed:', result);
+            } else if (!result.detection_active && !result.live_preview) {
+                // Clear gesture info when no hand is detected and not in detection mode
+                if (currentGesture) currentGesture.textContent = 'None';
+                if (confidenceEl) confidenceEl.textContent = '0%';
             }
-        } catch (error) {
-            console.error('Error processing frame:', error);
+            
+            // Update gesture count only for confirmed detections (not live preview)
+            if (result.gesture_count !== undefined && gestureCount && !result.live_preview) {
+                gestureCount.textContent = result.gesture_count.toString();
+                console.log('✅ Updated gesture count to:', result.gesture_count);
+            }
+        } else {
+            console.log('❌ Processing failed:', result);
         }
     }
 
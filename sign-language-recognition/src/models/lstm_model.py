@@ -10,10 +10,15 @@ import config
 Config = config.Config
 
 def create_model(num_classes, sequence_length=None):
-    """Create LSTM model for sign language recognition"""
+    """
+    Create LSTM model for sign language recognition
+    Pass sequence_length (e.g. Config.SEQUENCE_LENGTH) to fix the time axis; the
+    backend always feeds 30-frame windows, and a fixed shape lets the exported
+    TFLite graph use fused, statically shaped LSTM kernels.
+    """
     model = Sequential([
         Bidirectional(LSTM(Config.LSTM_UNITS, return_sequences=True, activation='relu'),
-                     input_shape=(None, Config.NUM_KEYPOINTS)),
+                     input_shape=(sequence_length, Config.NUM_KEYPOINTS)),
         Dropout(Config.DROPOUT_RATE),
         Bidirectional(LSTM(Config.LSTM_UNITS, return_sequences=False, activation='relu')),
         Dropout(Config.DROPOUT_RATE),
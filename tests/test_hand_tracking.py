@@ -0,0 +1,88 @@
+"""
+HandTracker frame-difference cache
+
+Run with: python -m unittest discover tests
+MediaPipe is replaced by a scripted fake, so these run without it installed.
+"""
+
+import sys
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from backend import hand_tracking
+from backend.hand_tracking import HandTracker, MAX_REUSED_FRAMES
+
+
+def _hand(value):
+    """MediaPipe-style result with one hand whose 21 landmarks are all (value, value, value)"""
+    point = types.SimpleNamespace(x=value, y=value, z=value)
+    hand = types.SimpleNamespace(landmark=[point] * 21)
+    return types.SimpleNamespace(multi_hand_landmarks=[hand])
+
+
+class _FakeHands:
+    """Stands in for mp.solutions.hands.Hands: returns the current scripted pose"""
+
+    def __init__(self, **kwargs):
+        self.pose = 0.1
+        self.calls = 0
+
+    def process(self, rgb_frame):
+        self.calls += 1
+        return _hand(self.pose)
+
+
+def _fake_mediapipe():
+    hands = types.SimpleNamespace(Hands=_FakeHands)
+    solutions = types.SimpleNamespace(hands=hands, drawing_utils=None)
+    return types.SimpleNamespace(solutions=solutions)
+
+
+class FrameCacheTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(sys.modules, {'mediapipe': _fake_mediapipe()}):
+            self.tracker = HandTracker()
+        self.hands = self.tracker.hands
+        self.frame = np.full((240, 320, 3), 128, dtype=np.uint8)
+
+    def test_similar_frames_reuse_landmarks(self):
+        first = self.tracker.detect_hands(self.frame)
+        second = self.tracker.detect_hands(self.frame.copy())
+        self.assertEqual(self.hands.calls, 1)
+        self.assertIs(second, first)
+
+    def test_changed_frame_runs_mediapipe(self):
+        self.tracker.detect_hands(self.frame)
+        self.tracker.detect_hands(np.zeros_like(self.frame))
+        self.assertEqual(self.hands.calls, 2)
+
+    def test_still_hand_shape_change_is_picked_up(self):
+        # Fist -> open hand without the thumbnail moving past the threshold
+        self.assertAlmostEqual(float(self.tracker.detect_hands(self.frame)[0]), 0.1, places=6)
+        self.hands.pose = 0.9
+
+        seen = [float(self.tracker.detect_hands(self.frame)[0]) for _ in range(MAX_REUSED_FRAMES + 1)]
+
+        # Cached pose for at most MAX_REUSED_FRAMES frames, then a real MediaPipe pass
+        self.assertEqual(seen[:MAX_REUSED_FRAMES], [seen[0]] * MAX_REUSED_FRAMES)
+        self.assertAlmostEqual(seen[-1], 0.9, places=6)
+        self.assertEqual(self.hands.calls, 2)
+
+    def test_reuse_is_never_unbounded(self):
+        frames = 4 * (MAX_REUSED_FRAMES + 1)
+        for _ in range(frames):
+            self.tracker.detect_hands(self.frame)
+        self.assertEqual(self.hands.calls, frames // (MAX_REUSED_FRAMES + 1))
+
+    def test_threshold_still_applies(self):
+        with mock.patch.object(hand_tracking, 'FRAME_DIFF_THRESHOLD', 0.0):
+            self.tracker.detect_hands(self.frame)
+            self.tracker.detect_hands(self.frame)
+        self.assertEqual(self.hands.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,18 @@ Configuration Management for SignSpeak AI
 
 import os
 import json
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Mapping
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # API Configuration
+# The environment doesn't change while the process runs, so each getter reads it
+# (and stats the service account file) once; reset_config_cache() forces a re-read
+@lru_cache(maxsize=1)
 def get_gemini_api_key() -> Optional[str]:
     """Get Gemini service account path for authentication"""
     # For service account authentication, return the path to the service account file
@@ -26,59 +31,70 @@ def get_gemini_api_key() -> Optional[str]:
     print("No valid Gemini credentials found. Please check your service_account.json or .env")
     return None
 
+@lru_cache(maxsize=1)
 def get_elevenlabs_api_key() -> Optional[str]:
     """Get ElevenLabs API key from environment variables"""
     return os.getenv('ELEVENLABS_API_KEY')
 
-def get_google_tts_config() -> dict:
-    """Get Google TTS configuration"""
-    return {
+@lru_cache(maxsize=1)
+def get_google_tts_config() -> Mapping[str, Optional[str]]:
+    """Get Google TTS configuration (read-only, shared between callers)"""
+    return MappingProxyType({
         'credentials_path': os.getenv('GOOGLE_TTS_CREDENTIALS'),
         'project_id': os.getenv('GOOGLE_CLOUD_PROJECT')
-    }
+    })
+
+def reset_config_cache() -> None:
+    """Forget cached credentials so the next call re-reads the environment"""
+    get_gemini_api_key.cache_clear()
+    get_elevenlabs_api_key.cache_clear()
+    get_google_tts_config.cache_clear()
+
+# Static settings below are read-only mappings: shared by every importer, so
+# accidental writes raise instead of silently changing config for everyone
 
 # Model Configuration
-MODEL_PATHS = {
+MODEL_PATHS = MappingProxyType({
     'asl_pickle': 'models/asl_model.pkl',
     'asl_cnn': 'models/asl_cnn.h5',
     'metadata': 'models/model_metadata.json'
-}
+})
 
 # Camera Configuration
-CAMERA_CONFIG = {
+CAMERA_CONFIG = MappingProxyType({
     'width': 640,
     'height': 480,
     'fps': 30,
     'device_id': 0
-}
+})
 
 # MediaPipe Configuration
-MEDIAPIPE_CONFIG = {
+MEDIAPIPE_CONFIG = MappingProxyType({
     'static_image_mode': False,
     'max_num_hands': 2,
     'min_detection_confidence': 0.5,
     'min_tracking_confidence': 0.5
-}
+})
 
 # Prediction Configuration
-PREDICTION_CONFIG = {
+PREDICTION_CONFIG = MappingProxyType({
     'confidence_threshold': 0.7,
     'letter_hold_time': 1.0,
     'word_gap_time': 2.0,
     'smoothing_window': 5
-}
+})
 
 # Translation Configuration
-TRANSLATION_CONFIG = {
+TRANSLATION_CONFIG = MappingProxyType({
     'default_target_language': 'es',
     'max_sentence_length': 500,
     'translation_timeout': 10
-}
+})
 
 # Speech Configuration
-SPEECH_CONFIG = {
+SPEECH_CONFIG = MappingProxyType({
     'default_voice': 'default',
     'speech_rate': 1.0,
     'volume': 1.0,
     'elevenlabs_voice_id': 'default'
-}
\ No newline at end of file
+})
\ No newline at end of file